@@ -15,11 +15,11 @@
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class IAdvertAPI(object):
-    def addResponder(self, advertId, responder):
+    def addResponder(self, advertId, responder, pooled=False):
         raise NotImplementedError('Interface method: %r' % (self,))
-    def addResponderFn(self, advertId, msgfn=None):
+    def addResponderFn(self, advertId, msgfn=None, pooled=False):
         raise NotImplementedError('Interface method: %r' % (self,))
-    def respondTo(self, advertId, msgfn=None):
+    def respondTo(self, advertId, msgfn=None, pooled=False):
         raise NotImplementedError('Interface method: %r' % (self,))
     def removeResponder(self, advertId, responder):
         raise NotImplementedError('Interface method: %r' % (self,))
@@ -35,12 +35,12 @@ class AdvertDelegateAPI(IAdvertAPI):
     #~ Advert Responders ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     _advertDb_ = None
 
-    def addResponder(self, advertId, responder):
-        return self._advertDb_.addResponder(advertId, responder)
-    def addResponderFn(self, advertId, msgfn=None):
-        return self._advertDb_.addResponderFn(advertId, msgfn)
-    def respondTo(self, advertId, msgfn=None):
-        return self._advertDb_.respondTo(advertId, msgfn)
+    def addResponder(self, advertId, responder, pooled=False):
+        return self._advertDb_.addResponder(advertId, responder, pooled)
+    def addResponderFn(self, advertId, msgfn=None, pooled=False):
+        return self._advertDb_.addResponderFn(advertId, msgfn, pooled)
+    def respondTo(self, advertId, msgfn=None, pooled=False):
+        return self._advertDb_.respondTo(advertId, msgfn, pooled)
     def removeResponder(self, advertId, responder):
         return self._advertDb_.removeResponder(advertId, responder)
 
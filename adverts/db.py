@@ -14,6 +14,7 @@ from .api import IAdvertAPI
 
 from .responder import FunctionAdvertResponder
 from .entry import AdvertEntry
+from .pooled import PooledAdvertResponder
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
@@ -116,27 +117,51 @@ class AdvertDB(IAdvertAPI):
     #~ Responders
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-    def addResponder(self, adKey, advertResponder):
+    PooledAdvertResponder = PooledAdvertResponder
+
+    def addResponder(self, adKey, advertResponder, pooled=False):
+        """With pooled, advertResponder's msg calls run on the task
+        manager's worker pool instead of the task thread.  Pooled
+        responders never count as handling a message, so messages sent
+        with forward(whenUnhandled=True) are still forwarded."""
         if advertResponder is None:
             raise ValueError("Cannot add a None advertResponder")
 
         e = self.find(adKey, True)
+        if pooled:
+            if self._findPooled(e, advertResponder) is not None:
+                return False
+            tasks = self.tasks
+            advertResponder = self.PooledAdvertResponder(
+                    advertResponder, tasks.getWorkerPool(), tasks.addTask)
+
         return e.addResponder(advertResponder)
 
     def removeResponder(self, adKey, advertResponder):
+        """Removes advertResponder, or else the pooled wrapper of it"""
         e = self.get(adKey)
         if e is not None:
-            return e.removeResponder(advertResponder)
-
-    def addResponderFn(self, advertId, msgfn=None):
+            if e.removeResponder(advertResponder):
+                return True
+            pooledResponder = self._findPooled(e, advertResponder)
+            if pooledResponder is not None:
+                return e.removeResponder(pooledResponder)
+            return False
+
+    def _findPooled(self, adEntry, advertResponder):
+        for r in adEntry.allResponders():
+            if isinstance(r, self.PooledAdvertResponder) and r.responder is advertResponder:
+                return r
+
+    def addResponderFn(self, advertId, msgfn=None, pooled=False):
         if msgfn is None:
             def bindFnAsResponder(msgfn):
-                self.addResponderFn(advertId, msgfn)
+                self.addResponderFn(advertId, msgfn, pooled)
                 return msgfn
             return bindFnAsResponder
         else:
             fnResponder = FunctionAdvertResponder(msgfn, advertId=advertId)
-            return self.addResponder(advertId, fnResponder)
+            return self.addResponder(advertId, fnResponder, pooled)
     respondTo = addResponderFn
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
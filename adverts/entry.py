@@ -26,12 +26,35 @@ def isBlatherRoute(wrRoute):
     if isBR is not None:
         return isBR()
 
+def overridesResponse(responder, name):
+    fn = getattr(responder, name, None)
+    if fn is None:
+        return False
+    return getattr(fn, 'im_func', fn) is not getattr(IAdvertResponder, name).im_func
+
+class AdvertDispatchPlan(object):
+    """Compiled responders of an AdvertEntry.  Only responders that
+    override the IAdvertResponder no-op hooks are listed for that hook,
+    so plain function responders only cost their msg call."""
+
+    __slots__ = ('responders', 'beginResponders', 'finishResponders', 'prohibitResponders')
+
+    def __init__(self, responders=()):
+        responders = tuple(responders)
+        self.responders = responders
+        self.beginResponders = tuple(r for r in responders if overridesResponse(r, 'beginResponse'))
+        self.finishResponders = tuple(r for r in responders if overridesResponse(r, 'finishResponse'))
+        self.prohibitResponders = tuple(r for r in responders if overridesResponse(r, 'prohibitForwardToward'))
+
+emptyDispatchPlan = AdvertDispatchPlan()
+
 class AdvertEntry(object):
-    __slots__ = ('_routes', '_responders')
+    __slots__ = ('_routes', '_responders', '_plan')
 
     def __init__(self, adKey):
         self._routes = None
         self._responders = None
+        self._plan = None
 
     def isAdvertEntry(self): 
         return True
@@ -94,6 +117,7 @@ class AdvertEntry(object):
 
         if aResponder not in responders:
             responders.append(aResponder)
+            self._plan = None
             return True
         else: return False
 
@@ -102,12 +126,24 @@ class AdvertEntry(object):
         if responders is None: 
             return False
 
-        elif responders not in aResponder: 
+        elif aResponder not in responders: 
             return False
 
-        repsonders.remove(aResponder)
-        return False
+        responders.remove(aResponder)
+        self._plan = None
+        return True
 
     def allResponders(self):
         return list(self._responders or ())
 
+    def getDispatchPlan(self):
+        """Returns the AdvertDispatchPlan of current responders, compiled
+        on first use after responders change"""
+        plan = self._plan
+        if plan is None:
+            if self._responders:
+                plan = AdvertDispatchPlan(self._responders)
+            else: plan = emptyDispatchPlan
+            self._plan = plan
+        return plan
+
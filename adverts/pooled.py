@@ -0,0 +1,82 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import with_statement
+
+from functools import partial
+
+from ..base import timestamp
+from ..base.tracebackBoundry import localtb
+from ..messages.stats import LatencyHistogram
+from .responder import IAdvertResponder
+from .entry import overridesResponse
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class PooledAdvertResponder(IAdvertResponder):
+    """Runs the msg calls of responder on a worker pool.
+
+    Routing, forwarding and the begin, finish and prohibit hooks stay on
+    the task thread.  Since the responder runs later, a pooled responder
+    never counts as handling the message, so forward(whenUnhandled=True)
+    still forwards it, and stats count it as unhandled.
+
+    The responder receives a copy of mctx whose sendMsg hands replies back
+    to the task thread through addTask, so replies must be sent with
+    mctx.sendMsg or mctx.reply rather than mobj.send().  Each call's
+    latency, from dispatch to completion, is recorded in latency; the
+    time spent in the responder alone in runLatency.
+
+    Wrappers compare by identity, never equal to the responder they wrap;
+    AdvertDB.removeResponder finds a pooled wrapper by its responder."""
+
+    timestamp = staticmethod(timestamp)
+    LatencyHistogram = LatencyHistogram
+
+    def __init__(self, responder, pool, addTask):
+        self.responder = responder
+        self.pool = pool
+        self.addTask = addTask
+        self.latency = self.LatencyHistogram()
+        self.runLatency = self.LatencyHistogram()
+
+        # only expose the hooks responder actually implements, so dispatch
+        # plans skip the rest just as they would for responder itself
+        for name in ('beginResponse', 'finishResponse', 'prohibitForwardToward'):
+            if overridesResponse(responder, name):
+                setattr(self, name, getattr(responder, name))
+
+    def __repr__(self):
+        return '<%s %r>' % (self.__class__.__name__, self.responder)
+
+    def msg(self, body, fmt, topic, mctx):
+        mctx = mctx.deferSends(self.addTask)
+        self.pool.addTask(partial(self._runMsg, body, fmt, topic, mctx, self.timestamp()))
+        # not yet handled; the responder has not run
+        return False
+
+    def _runMsg(self, body, fmt, topic, mctx, tsQueued):
+        ts = self.timestamp()
+        try:
+            with localtb:
+                self.responder.msg(body, fmt, topic, mctx)
+        finally:
+            tsDone = self.timestamp()
+            self.runLatency.add(tsDone - ts)
+            self.latency.add(tsDone - tsQueued)
+
+    def stats(self):
+        return dict(latency=self.latency.snapshot(), runLatency=self.runLatency.snapshot())
+
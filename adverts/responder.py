@@ -37,12 +37,12 @@ class IAdvertResponder(object):
     def msg(self, body, fmt, topic, mctx):
         pass
 
-    def addAsResponderTo(self, host, advertId=None):
+    def addAsResponderTo(self, host, advertId=None, pooled=False):
         if advertId is None:
             advertId = getattr(self, 'advertId', None)
             if advertId is None:
                 raise ValueError("advertId is None")
-        return host.addResponder(advertId, self)
+        return host.addResponder(advertId, self, pooled)
     addTo = property(lambda self: self.addAsResponderTo)
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -15,10 +15,28 @@
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class MsgExecuteAPI(object):
+    __slots__ = ()
+
+    # executors that accept MsgBodyRef handles in place of msg body strs
+    lazyMsgBody = False
+
     def cmdPerform(self, fnName, args):
         fn = getattr(self, fnName)
         return fn(*args)
 
+    cmdNames = ('forwardOnce', 'forward', 'replyRef', 'adRefs', 'msg', 'end')
+
+    @classmethod
+    def cmdFunctions(klass):
+        """Returns {cmdName: function} for klass, bound once per class and
+        called as fn(mx, *args) during playback"""
+        cmdFns = klass.__dict__.get('_cmdFns_')
+        if cmdFns is None:
+            cmdFns = dict((name, getattr(klass, name).im_func)
+                    for name in klass.cmdNames)
+            klass._cmdFns_ = cmdFns
+        return cmdFns
+
     def advertMsgId(self, advertId, msgId=None, src=None):
         pass
 
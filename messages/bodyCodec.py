@@ -0,0 +1,159 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import zlib
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class EncodedBody(str):
+    """A msg body still in its wire encoding.
+
+    The str value is the encoded bytes, so encoders and forwarders pass it
+    along untouched.  Call decodeBody() to get the original body."""
+
+    __slots__ = ()
+    bodyCodec = None
+
+    def __repr__(self):
+        return '<%s %s bytes>' % (self.__class__.__name__, len(self))
+
+    def decodeBody(self):
+        return self.bodyCodec.decodeBody(self)
+
+class MsgBodyRef(object):
+    """Lazy msg body referencing [iStart:iEnd] of the packet it was
+    decoded from.  Nothing is copied until str() or decodeBody()"""
+
+    __slots__ = ('packet', 'iStart', 'iEnd', 'bodyCodec')
+
+    def __init__(self, packet, iStart, iEnd, bodyCodec=None):
+        self.packet = packet
+        self.iStart = iStart
+        self.iEnd = iEnd
+        self.bodyCodec = bodyCodec
+
+    def __repr__(self):
+        return '<%s %s bytes>' % (self.__class__.__name__, len(self))
+
+    def __len__(self):
+        return self.iEnd - self.iStart
+    def __str__(self):
+        return self.packet[self.iStart:self.iEnd]
+    def buffer(self):
+        return buffer(self.packet, self.iStart, self.iEnd - self.iStart)
+
+    def decodeBody(self):
+        body = self.packet[self.iStart:self.iEnd]
+        if self.bodyCodec is not None:
+            body = self.bodyCodec.decodeBody(body)
+        return body
+
+def decodeBody(body):
+    if isinstance(body, (EncodedBody, MsgBodyRef)):
+        return body.decodeBody()
+    return body
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgBodyCodec(object):
+    codecId = None
+    minSize = 512
+    maxBodySize = 1<<20
+
+    def __init__(self, minSize=None, maxBodySize=None):
+        if minSize is not None:
+            self.minSize = minSize
+        if maxBodySize is not None:
+            self.maxBodySize = maxBodySize
+
+        name = self.__class__.__name__.replace('Codec', '')
+        self.EncodedBody = type(EncodedBody)(name, (EncodedBody,),
+                dict(__slots__=(), bodyCodec=self))
+
+    def encodeBody(self, body):
+        """Returns an EncodedBody, or body itself when it is below minSize
+        or does not shrink"""
+        if len(body) < self.minSize:
+            return body
+
+        data = self.compress(body)
+        # one byte is spent on the body codec command
+        if len(data) + 1 >= len(body):
+            return body
+        return self.EncodedBody(data)
+
+    def decodeBody(self, data):
+        """Returns the original body; raises ValueError when data is
+        malformed or would decode to more than maxBodySize bytes"""
+        return self.decompress(data)
+
+    def compress(self, body):
+        raise NotImplementedError('Subclass Responsibility: %r' % (self,))
+    def decompress(self, data):
+        raise NotImplementedError('Subclass Responsibility: %r' % (self,))
+
+class ZlibBodyCodec(MsgBodyCodec):
+    codecId = 0x1
+    level = 6
+
+    def compress(self, body):
+        return zlib.compress(body, self.level)
+    def decompress(self, data):
+        # bound the inflated size, so a peer cannot send a zlib bomb
+        maxBodySize = self.maxBodySize
+        dobj = zlib.decompressobj()
+        try:
+            body = dobj.decompress(data, maxBodySize)
+            if not dobj.unconsumed_tail:
+                body += dobj.flush()
+        except zlib.error, err:
+            raise ValueError("Malformed zlib body: %s" % (err,))
+
+        if dobj.unconsumed_tail or len(body) > maxBodySize:
+            raise ValueError("Body inflates past maxBodySize: %r" % (maxBodySize,))
+        return body
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+bodyCodecMap = {}
+def registerBodyCodec(bodyCodec):
+    if not (0 < bodyCodec.codecId <= 0xf):
+        raise ValueError("Body codec id not in range [1..f]: %r" % (bodyCodec.codecId,))
+    bodyCodecMap[bodyCodec.codecId] = bodyCodec
+    return bodyCodec
+
+zlibBodyCodec = registerBodyCodec(ZlibBodyCodec())
+
+def bodyCodecFor(codecId):
+    bodyCodec = bodyCodecMap.get(codecId)
+    if bodyCodec is None:
+        raise ValueError("Unknown body codec: %r" % (codecId,))
+    return bodyCodec
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class EncodedBodyMsg(object):
+    """Passes the next msg command on to mx with its body wrapped as
+    bodyCodec's EncodedBody"""
+
+    def __init__(self, mx, bodyCodec):
+        self.mx = mx
+        self.bodyCodec = bodyCodec
+
+    def msg(self, body, fmt=0, topic=None):
+        if isinstance(body, MsgBodyRef):
+            body.bodyCodec = self.bodyCodec
+        else: body = self.bodyCodec.EncodedBody(body)
+        return self.mx.msg(body, fmt, topic)
+
@@ -0,0 +1,155 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import with_statement
+
+from struct import Struct
+from functools import partial
+
+from ..base.threadutils import Lock
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Bundle Format
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# A bundle is a single datagram carrying several complete packets:
+#   [bundleVersion] ([2-byte packet length][packet])*
+# Each packet keeps its own version, msgId and advertId header, so the
+# receiver demultiplexes and filters every packet independently.
+
+msgBundleVersion = '\x0f'
+packetLen = Struct('!H')
+bundleOverhead = len(msgBundleVersion)
+packetOverhead = packetLen.size
+
+def packBundle(packets):
+    packLen = packetLen.pack
+    parts = [msgBundleVersion]
+    for packet in packets:
+        parts.append(packLen(len(packet)))
+        parts.append(packet)
+    return ''.join(parts)
+
+def splitBundle(bundle):
+    """Returns the list of packets in bundle.  The whole frame is checked
+    first, so a malformed bundle raises ValueError before any packet is
+    returned."""
+    if bundle[:1] != msgBundleVersion:
+        raise ValueError("Not a packet bundle")
+
+    unpackLen = packetLen.unpack_from
+    packets = []
+    i = bundleOverhead; iEnd = len(bundle)
+    while i < iEnd:
+        if i + packetOverhead > iEnd:
+            raise ValueError("Truncated packet bundle length prefix")
+        n, = unpackLen(bundle, i)
+        i += packetOverhead
+        if i + n > iEnd:
+            raise ValueError("Truncated packet bundle")
+        packets.append(bundle[i:i+n])
+        i += n
+    return packets
+
+def iterBundle(bundle):
+    for packet in splitBundle(bundle):
+        yield packet
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Send-side Batching
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgPacketBatcher(object):
+    """Coalesces packets sent toward the same route into bundles.
+
+    Packets are held per route until the pending bundle would exceed mtu,
+    or until flushDelay seconds after the first packet was held, whichever
+    comes first.  A batch holding a single packet is sent as that packet,
+    so a lone message costs no framing overhead."""
+
+    mtu = 1400
+    flushDelay = 0.002
+
+    def __init__(self, tasks, mtu=None, flushDelay=None):
+        self.tasks = tasks
+        if mtu is not None:
+            self.mtu = mtu
+        if flushDelay is not None:
+            self.flushDelay = flushDelay
+
+        self.lock = Lock()
+        self.pending = {}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def sendDispatch(self, route, packet):
+        """Queue packet toward route, a weakref to a blather route.
+        Returns False if route is gone, or refused a packet sent at once;
+        queued packets count as accepted."""
+        if route() is None:
+            return False
+
+        size = packetOverhead + len(packet)
+        if bundleOverhead + size > self.mtu:
+            # would never fit in a bundle; flush what is pending toward
+            # route first to keep order, then send as-is
+            self.flush(route)
+            return self._sendPackets(route, [packet])
+
+        flushPackets = None
+        with self.lock:
+            entry = self.pending.get(route)
+            bNew = entry is None
+            if bNew:
+                entry = [bundleOverhead, []]
+                self.pending[route] = entry
+            elif entry[0] + size > self.mtu:
+                flushPackets = entry[1]
+                entry[:] = [bundleOverhead, []]
+
+            entry[0] += size
+            entry[1].append(packet)
+
+        if flushPackets:
+            self._sendPackets(route, flushPackets)
+        if bNew:
+            self.tasks.addTimer(self.flushDelay, partial(self._onFlushTimer, route))
+        return True
+
+    def flush(self, route=None):
+        with self.lock:
+            if route is None:
+                flushList = self.pending.items()
+                self.pending.clear()
+            else:
+                entry = self.pending.pop(route, None)
+                flushList = [(route, entry)] if entry else []
+
+        for route, (size, packets) in flushList:
+            self._sendPackets(route, packets)
+        return len(flushList)
+
+    def _onFlushTimer(self, route, ts):
+        self.flush(route)
+
+    def _sendPackets(self, route, packets):
+        route = route()
+        if route is None or not packets:
+            return False
+
+        if len(packets) == 1:
+            r = route.sendDispatch(packets[0])
+        else: r = route.sendDispatch(packBundle(packets))
+        # closed routes return False from sendDispatch
+        return r is not False
+
@@ -11,6 +11,8 @@
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 from __future__ import with_statement
+from copy import copy
+from functools import partial
 from contextlib import contextmanager
 from ..base import timestamp, PacketNS
 from .api import IMessageAPI
@@ -29,6 +31,9 @@ class MsgContext(IMessageAPI):
 
     mrules = None
     handled = False
+    deferred = False
+    # set once any responder has been handed this context
+    exposed = False
     
     def __init__(self, advertId, msgId, src):
         src = PacketNS(src)
@@ -71,6 +76,24 @@ class MsgContext(IMessageAPI):
     def sendMsg(self, mobj):
         return self.host.sendMsg(mobj)
 
+    def deferSends(self, addTask):
+        """Returns a copy of this context for use off the task thread,
+        whose sendMsg hands each message to addTask to be sent from the
+        task thread.  The copy has its own src and adRefs, so the task
+        thread may go on reusing this context's."""
+        self.deferred = True
+        mctx = copy(self)
+        mctx.src = self.src.copy()
+        mctx.adRefs = dict((k, list(v)) for k, v in self.adRefs.iteritems())
+        mctx.sendMsg = partial(self._deferSendMsg, addTask)
+        return mctx
+    def _deferSendMsg(self, addTask, mobj):
+        addTask(partial(self._sendDeferredMsg, mobj))
+        return True
+    def _sendDeferredMsg(self, mobj):
+        # tasks returning a true value are continued, so drop the result
+        self.host.sendMsg(mobj)
+
     def replyMsg(self, replyId=True, respondId=True):
         if replyId is True: replyId = self.replyId
         if respondId is True: respondId = self.advertId
@@ -11,10 +11,13 @@
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 from __future__ import with_statement
+from functools import partial
 from ..base.tracebackBoundry import localtb
+from ..adverts.entry import emptyDispatchPlan
 
 from .context import MsgContext
 from .apiMsgExecute import MsgExecuteAPI
+from .bodyCodec import decodeBody
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Message Dispatch Rules
@@ -57,6 +60,12 @@ class MsgDispatch(MsgExecuteAPI):
     MsgDispatchRules = MsgDispatchRules
     MsgContext = MsgContext 
     mctx = None
+    batcher = None
+    stats = None
+    tasks = None
+    lazyMsgBody = True
+    adResponders = ()
+    finishResponders = ()
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     #~ Sending Facilities
@@ -83,14 +92,17 @@ class MsgDispatch(MsgExecuteAPI):
         self.mctx = mctx
 
         if adEntry is not None:
-            adResponders = adEntry.allResponders()
-        else: adResponders = []
+            plan = adEntry.getDispatchPlan()
+        else: plan = emptyDispatchPlan
+        if plan.responders:
+            mctx.exposed = True
 
         mrules = self.MsgDispatchRules(adEntry)
         mctx.mrules = mrules
 
-        self.adResponders = adResponders
-        for r in adResponders:
+        self.adResponders = plan.responders
+        self.finishResponders = plan.finishResponders
+        for r in plan.beginResponders:
             with localtb:
                 r.beginResponse(mctx, mrules)
 
@@ -99,6 +111,11 @@ class MsgDispatch(MsgExecuteAPI):
     def noForward(self):
         return self.mctx
     def forward(self, breadthLimit=1, whenUnhandled=True, fwdAdvertId=None):
+        """Sends the packet on toward the advert's routes.  Packets that
+        arrived over a route are relayed on the task manager's relay lane,
+        which sheds its oldest tasks under overload; shed forwards are not
+        counted as forwarded in stats, only in laneStats()['shed'].  Local
+        sends and replies go out directly."""
         mctx = self.mctx
         if breadthLimit < 0:
             if breadthLimit is not None:
@@ -121,7 +138,8 @@ class MsgDispatch(MsgExecuteAPI):
             # lookup entry for specified fwdAdEntry
             fwdEntry = self.advertDb.getForwardEntry(fwdAdvertId)
             if fwdEntry is not None:
-                for fr in fwdEntry.allResponders():
+                for fr in fwdEntry.getDispatchPlan().prohibitResponders:
+                    mctx.exposed = True
                     if fr.prohibitForwardToward(mctx):
                         # do not break -- notify all entries of the attempt
                         fwdEntry = None
@@ -136,15 +154,41 @@ class MsgDispatch(MsgExecuteAPI):
             return
 
         srcRoutes = [mctx.src.recvRoute, mctx.src.route]
-        # actually accomplish the forward!
-        for route in fwdRoutes:
-            if route in srcRoutes:
-                # Skip source routes, cause they already know
-                continue
+        # skip source routes, cause they already know
+        fwdRoutes = [r for r in fwdRoutes if r not in srcRoutes]
+        if not fwdRoutes:
+            return mctx
 
-            route().sendDispatch(fwdPacket)
+        recvRoute = mctx.src.recvRoute
+        tasks = self.tasks
+        if tasks is not None and recvRoute is not None:
+            # relay on the task manager's relay lane, so forward storms
+            # queue behind local dispatch and shed first under overload
+            tasks.addTask(partial(self._sendForward, fwdRoutes, fwdPacket,
+                    mctx.advertId, recvRoute), tasks.laneRelay)
+        else: self._sendForward(fwdRoutes, fwdPacket, mctx.advertId, recvRoute)
         return mctx
 
+    def _sendForward(self, fwdRoutes, fwdPacket, advertId, recvRoute):
+        batcher = self.batcher
+        nFwd = 0
+        # actually accomplish the forward!
+        for route in fwdRoutes:
+            if batcher is not None:
+                accepted = batcher.sendDispatch(route, fwdPacket)
+            else:
+                r = route()
+                if r is None:
+                    continue
+                # closed routes return False from sendDispatch
+                accepted = r.sendDispatch(fwdPacket) is not False
+            if accepted:
+                nFwd += 1
+
+        stats = self.stats
+        if nFwd and stats is not None:
+            stats.count(advertId, recvRoute, stats.iForwarded, nFwd)
+
     def replyRef(self, replyAdvertIds):
         if isinstance(replyAdvertIds, str):
             replyAdvertIds = [replyAdvertIds]
@@ -164,7 +208,19 @@ class MsgDispatch(MsgExecuteAPI):
 
     def msg(self, body, fmt=0, topic=None):
         mctx = self.mctx
-        for r in self.adResponders:
+        adResponders = self.adResponders
+        if not adResponders:
+            return mctx
+
+        # bodies are only copied and inflated when someone will read them;
+        # a malformed or oversized body is logged and the msg dropped
+        encBody, body = body, None
+        with localtb:
+            body = decodeBody(encBody)
+        if body is None:
+            return mctx
+
+        for r in adResponders:
             with localtb:
                 v = r.msg(body, fmt, topic, mctx)
                 if v is not False:
@@ -176,7 +232,7 @@ class MsgDispatch(MsgExecuteAPI):
 
     def complete(self):
         mctx = self.mctx
-        for r in self.adResponders:
+        for r in self.finishResponders:
             with localtb:
                 r.finishResponse(mctx)
         return mctx
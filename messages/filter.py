@@ -10,51 +10,397 @@
 #~ Imports 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+from __future__ import with_statement
+
+import time
+import weakref
+from functools import partial
+from struct import Struct
+from array import array
+from math import log, ceil
+from random import randrange
+
+from ..base.threadutils import Lock
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-class MsgAdvertIdBloomFilter(object):
+class MsgFilterBase(object):
+    """Dedupe filters remember (msgId, advertId prefix) keys, so packets
+    that share a msgId but target different adverts are distinct.  Keys
+    are remembered over generations that rotate every
+    period seconds.  Once startRotation is given a task manager, rotation
+    is driven by its timers; otherwise the tip age is checked on update.
+
+    Counters: nCaught duplicates rejected, nPassed msgIds let through, and
+    nEvicted msgIds forgotten early to stay within the memory cap, which
+    are the duplicates that may be let through."""
+
+    period = 1.0
+    timer = staticmethod(time.time)
+    _checkPeriod = True
+
+    nCaught = 0
+    nPassed = 0
+    nEvicted = 0
+
     nAdvertId = 4
-    depth = 20
-    breadth = 1000
+    _unpackKey = Struct('!Q').unpack
 
-    def __init__(self):
-        self.msgIdSets = [dict() for e in xrange(self.depth)]
+    def filterKey(self, advertId, msgId):
+        """Returns (msgId, advertId prefix) packed as an 8-byte int when
+        they fit, as for packet_v02 msgIds, and as a str otherwise"""
+        key = msgId + advertId[:self.nAdvertId]
+        if len(key) == 8:
+            key, = self._unpackKey(key)
+        return key
 
     def __call__(self, advertId, msgId):
-        return self.test(advertId, msgId, True)
+        if self.test(advertId, msgId, True):
+            self.nCaught += 1
+            return True
+        self.nPassed += 1
+        return False
+
+    def test(self, advertId, msgId, bUpdate=False):
+        raise NotImplementedError('Subclass Responsibility: %r' % (self,))
+    def rotate(self, bEvict=False):
+        raise NotImplementedError('Subclass Responsibility: %r' % (self,))
+
+    def stats(self):
+        return dict(caught=self.nCaught, passed=self.nPassed,
+                evicted=self.nEvicted, remembered=len(self))
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def startRotation(self, tasks):
+        """Rotate generations every period seconds from tasks timers.  The
+        timer only holds the filter weakly, and ends at the first tick
+        after stopRotation or after the filter is collected."""
+        self._checkPeriod = False
+        tasks.addTimer(self.period, partial(self._onRotateTimer, weakref.ref(self)))
+
+    def stopRotation(self):
+        self._checkPeriod = True
+
+    @staticmethod
+    def _onRotateTimer(wrFilter, ts):
+        self = wrFilter()
+        if self is None or self._checkPeriod:
+            # filter collected or rotation stopped
+            return None
+        self.rotate()
+        return self.period
+
+    def _isTipExpired(self):
+        return self._checkPeriod and (self.timer() - self.tsTip >= self.period)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgAdvertIdBloomFilter(MsgFilterBase):
+    """Exact dedupe over the last depth generations of period seconds
+    each.  At most maxEntries keys are remembered; past that, the oldest
+    non-empty generation is evicted early, leaving rotation to the
+    period.  See MsgCuckooFilter for the fixed memory filter."""
+
+    depth = 20
+    period = 1.0
+    maxEntries = 100000
+
+    def __init__(self, period=None, depth=None, maxEntries=None):
+        if period is not None:
+            self.period = period
+        if depth is not None:
+            self.depth = depth
+        if maxEntries is not None:
+            self.maxEntries = maxEntries
+
+        self.keySets = [set() for e in xrange(self.depth)]
+        self.count = 0
+        self.tsTip = self.timer()
+
+    def __len__(self):
+        return self.count
 
     def test(self, advertId, msgId, bUpdate=False):
         if msgId is None:
             # msgId of None indicates a new instance
             return False
 
-        msgIdSets = self.msgIdSets
-        for msgSet in msgIdSets:
-            entry = msgSet.pop(msgId, None)
-            if entry is not None: 
+        key = self.filterKey(advertId, msgId)
+        for keySet in self.keySets:
+            if key in keySet: 
                 found = True
                 break
         else:
             found = False
-            entry = set()
                                 
         if bUpdate:
-            self.update(advertId, msgId, entry)
+            if found:
+                # refresh key into the tip generation
+                keySet.discard(key)
+                self.count -= 1
+            self.update(key)
 
         return found
 
-    def update(self, advertId, msgId, entry):
-        entry.add(advertId[:self.nAdvertId])
+    def update(self, key):
+        if self._isTipExpired():
+            self.rotate()
+        if self.count >= self.maxEntries:
+            self.evictOldest()
+
+        self.keySets[0].add(key)
+        self.count += 1
+
+    def evictOldest(self):
+        """Forgets the oldest non-empty generation before its time, without
+        starting a new tip generation"""
+        for keySet in reversed(self.keySets):
+            if keySet:
+                break
+        else: return 0
+
+        n = len(keySet)
+        keySet.clear()
+        self.count -= n
+        self.nEvicted += n
+        return n
+
+    def rotate(self, bEvict=False):
+        """Starts a new, empty tip generation, forgetting the oldest.
+        bEvict marks the forgotten keys as evicted before their time."""
+        keySets = self.keySets
+
+        # reuse last keySet, cleared, as new tip
+        tip = keySets.pop()
+        n = len(tip)
+        tip.clear()
+        keySets.insert(0, tip)
+
+        self.count -= n
+        if bEvict:
+            self.nEvicted += n
+        self.tsTip = self.timer()
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgCuckooFilter(MsgFilterBase):
+    """Fixed memory dedupe filter.
+
+    Each generation is a cuckoo hash table of bucketSize fingerprints
+    preallocated in an array, so test and insert look at exactly two
+    buckets per generation.  The tip generation is rotated out once it
+    holds capacity msgIds, or once it is period seconds old, keeping the
+    table load and the false positive rate bounded.  MsgIds forgotten by
+    a capacity rotation are counted as evicted.
+
+    fpRate is the chance that an unseen msgId is reported as a duplicate;
+    it picks the fingerprint width.  Memory is fixed at construction, and
+    msgIds are remembered for at least one full generation."""
+
+    capacity = 16384
+    generations = 2
+    period = 10.0
+    fpRate = 1e-6
+
+    bucketSize = 4
+    maxLoad = 0.9
+    maxKicks = 128
+
+    _fpTypecodes = [(8, 'B'), (16, 'H'), (32, 'I')]
+
+    def __init__(self, capacity=None, fpRate=None, period=None, generations=None):
+        if capacity is not None:
+            self.capacity = capacity
+        if fpRate is not None:
+            self.fpRate = fpRate
+        if period is not None:
+            self.period = period
+        if generations is not None:
+            self.generations = generations
+
+        self._cfgTables()
+        self.tables = [self._newTable() for e in xrange(self.generations)]
+        self.counts = [0] * self.generations
+        self.count = 0
+        self.tsTip = self.timer()
+
+    def _cfgTables(self):
+        b = self.bucketSize
+        nBuckets = max(1, int(ceil(self.capacity / (b * self.maxLoad))))
+        nBits = max(1, int(ceil(log(nBuckets, 2))))
+        self.nBits = nBits
+        self.idxMask = (1 << nBits) - 1
+        self.capacity = int((1 << nBits) * b * self.maxLoad)
+
+        # an unseen msgId matches one of 2*bucketSize fingerprints per generation
+        fpBits = log(2 * b * self.generations / self.fpRate, 2)
+        for bits, typecode in self._fpTypecodes:
+            if bits >= fpBits:
+                break
+        else:
+            raise ValueError("False positive rate too small: %r" % (self.fpRate,))
+        self.fpMask = (1 << bits) - 1
+        self.typecode = typecode
+
+    def _newTable(self):
+        return array(self.typecode, [0]) * ((1 << self.nBits) * self.bucketSize)
+
+    def __len__(self):
+        return sum(self.counts[1:], self.count)
+
+    def getMemorySize(self):
+        return sum(t.itemsize * len(t) for t in self.tables)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def _hash(self, key):
+        # fold high bits down before mixing, since packed keys of one
+        # advert share their low 32 bits
+        h = hash(key) & 0xffffffffffffffff
+        h = ((h ^ (h >> 32)) * 0x9e3779b97f4a7c15) & 0xffffffffffffffff
+        fp = (h >> 8) & self.fpMask or 1
+        return h >> (64 - self.nBits), fp
+
+    def _altIdx(self, idx, fp):
+        return (idx ^ (fp * 0x5bd1e995)) & self.idxMask
+
+    def test(self, advertId, msgId, bUpdate=False):
+        if msgId is None:
+            # msgId of None indicates a new instance
+            return False
+
+        # inlined _hash and _altIdx
+        key = self.filterKey(advertId, msgId)
+        h = hash(key) & 0xffffffffffffffff
+        h = ((h ^ (h >> 32)) * 0x9e3779b97f4a7c15) & 0xffffffffffffffff
+        fp = (h >> 8) & self.fpMask or 1
+        idx = h >> (64 - self.nBits)
+        b = self.bucketSize
+        i0 = idx*b; i1 = ((idx ^ (fp * 0x5bd1e995)) & self.idxMask)*b
+
+        for gen, table in enumerate(self.tables):
+            if fp in table[i0:i0+b] or fp in table[i1:i1+b]:
+                break
+        else: gen = None
+
+        if bUpdate and gen != 0:
+            # new msgIds, and duplicates still arriving, go to the tip
+            self._insert(idx, fp)
+        return gen is not None
+
+    def update(self, key):
+        idx, fp = self._hash(key)
+        self._insert(idx, fp)
+
+    def _insert(self, idx, fp):
+        if self._isTipExpired():
+            self.rotate()
+        elif self.count >= self.capacity:
+            self.rotate(True)
+
+        victim = self._place(self.tables[0], idx, fp)
+        if victim is not None:
+            # tip is too full to place the last evicted fingerprint
+            self.rotate(True)
+            self._place(self.tables[0], *victim)
+        self.count += 1
+
+    def _place(self, table, idx, fp):
+        """Places fp in table, returning None, or the (idx, fp) evicted
+        after maxKicks relocations"""
+        b = self.bucketSize
+        altIdx = self._altIdx
+        for i in (idx, altIdx(idx, fp)):
+            i *= b
+            bucket = table[i:i+b]
+            if 0 in bucket:
+                table[i + bucket.index(0)] = fp
+                return None
+
+        for n in xrange(self.maxKicks):
+            i = idx*b + randrange(b)
+            fp, table[i] = table[i], fp
+            idx = altIdx(idx, fp)
+
+            i = idx*b
+            bucket = table[i:i+b]
+            if 0 in bucket:
+                table[i + bucket.index(0)] = fp
+                return None
+        return idx, fp
+
+    def rotate(self, bEvict=False):
+        """Starts a new, empty tip generation, forgetting the oldest.
+        bEvict marks the forgotten msgIds as evicted before their time."""
+        tables = self.tables
+        tables.pop()
+        tables.insert(0, self._newTable())
+
+        counts = self.counts
+        counts[0] = self.count
+        n = counts.pop()
+        counts.insert(0, 0)
+        self.count = 0
+        if bEvict:
+            self.nEvicted += n
+        self.tsTip = self.timer()
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgShardedFilter(MsgFilterBase):
+    """Thread safe dedupe filter for concurrent receive threads.
+
+    Keys are partitioned by msgId hash over nShards filters, each guarded
+    by its own lock, so threads contend only when their msgIds land on the
+    same shard.  kw configure each MsgFilter shard, so sizes given there
+    are per shard."""
+
+    nShards = 8
+    MsgFilter = MsgCuckooFilter
+
+    def __init__(self, nShards=None, MsgFilter=None, **kw):
+        if nShards is not None:
+            self.nShards = nShards
+        if MsgFilter is not None:
+            self.MsgFilter = MsgFilter
+
+        self.shards = [(Lock(), self.MsgFilter(**kw)) for e in xrange(self.nShards)]
+        self.period = self.shards[0][1].period
+
+    def __len__(self):
+        return sum(len(shard) for lock, shard in self.shards)
+
+    def _sumShards(attr):
+        return property(lambda self: sum(getattr(shard, attr) for lock, shard in self.shards))
+    nCaught = _sumShards('nCaught')
+    nPassed = _sumShards('nPassed')
+    nEvicted = _sumShards('nEvicted')
+    del _sumShards
+
+    def __call__(self, advertId, msgId):
+        lock, shard = self.shards[hash(msgId) % self.nShards]
+        with lock:
+            return shard(advertId, msgId)
+
+    def test(self, advertId, msgId, bUpdate=False):
+        lock, shard = self.shards[hash(msgId) % self.nShards]
+        with lock:
+            return shard.test(advertId, msgId, bUpdate)
 
-        msgIdSets = self.msgIdSets
-        tip = msgIdSets[0]
-        tip[msgId] = entry
+    def rotate(self, bEvict=False):
+        for lock, shard in self.shards:
+            with lock:
+                shard.rotate(bEvict)
 
-        if len(tip) >= self.breadth:
-            # reuse last msgIdSet, cleared, as new tip
-            tip = msgIdSets.pop()
-            tip.clear()
-            msgIdSets.insert(0, tip)
+    def startRotation(self, tasks):
+        for lock, shard in self.shards:
+            shard._checkPeriod = False
+        MsgFilterBase.startRotation(self, tasks)
 
+    def stopRotation(self):
+        for lock, shard in self.shards:
+            shard._checkPeriod = True
+        MsgFilterBase.stopRotation(self)
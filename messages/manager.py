@@ -10,14 +10,23 @@
 #~ Imports 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+from __future__ import with_statement
+
 import weakref
-from functools import partial
+from collections import deque
+
+from ..base import timestamp
+from ..base.tracebackBoundry import localtb
+from ..base.threadutils import Lock
 
 from .api import IMessageAPI
 from .dispatch import MsgDispatch
-from .msgObject import msgDecoderMap, MsgObject
+from .msgObject import msgCodecMap, MsgObject
 from .msgPPrint import MsgPPrint
 from .filter import MsgAdvertIdBloomFilter
+from .bundle import MsgPacketBatcher, msgBundleVersion, splitBundle
+from .msgCompact import MsgCompactPool
+from .stats import MsgStats
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
@@ -25,37 +34,176 @@ from .filter import MsgAdvertIdBloomFilter
 
 class MessageMgr(IMessageAPI):
     MsgObject = MsgObject
+    # The default dedupe is exact, so legitimate messages are never dropped.
+    # MsgCuckooFilter is the opt-in fixed memory alternative, whose false
+    # positives drop messages, and MsgShardedFilter is safe to share
+    # between receive threads.
+    MsgFilter = MsgAdvertIdBloomFilter
 
     def __init__(self, host):
         self.host = host.asWeakProxy()
         self.tasks = host.tasks.asWeakProxy()
         self.advertDb = host.advertDb
-        self.msgFilter = MsgAdvertIdBloomFilter()
+        self.msgFilter = self.MsgFilter()
+        self.msgFilter.startRotation(self.tasks)
+        self.stats = MsgStats()
+        self._dispatchQ = deque()
+        self._lockDrain = Lock()
+        self.compactPool = MsgCompactPool(weakref.proxy(self))
         self._cfgFlyweights()
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+    MsgPacketBatcher = MsgPacketBatcher
+    batcher = None
+
+    def setPacketBatching(self, enable=True, mtu=None, flushDelay=None):
+        """Coalesce outbound packets per route into bundles of up to mtu
+        bytes, flushed at most flushDelay seconds after the first packet.
+        Peers must be able to receive bundles."""
+        batcher = self.batcher
+        if batcher is not None:
+            batcher.flush()
+
+        if enable:
+            batcher = self.MsgPacketBatcher(self.tasks, mtu, flushDelay)
+        else: batcher = None
+
+        self.batcher = batcher
+        self.MsgQDispatch.batcher = batcher
+        return batcher
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
     def newMsg(self, advertId=None, replyId=None):
         return self.MsgObject(advertId, replyId)
+    def newCompactMsg(self, advertId=None, replyId=None):
+        """Pooled, slotted message; recycled once dispatched, unless a
+        local responder was handed it"""
+        return self.compactPool.newMsg(advertId, replyId)
     def sendMsg(self, mobj):
         mobj.enqueSendOn(self)
         return self.queueMsg(mobj)
 
     def queueMsg(self, mobj):
-        if self.msgFilter(mobj.advertId, mobj.ensureMsgId()):
+        advertId = mobj.advertId
+        stats = self.stats
+        stats.count(advertId, None, stats.iReceived)
+        if self.msgFilter(advertId, mobj.ensureMsgId()):
+            stats.count(advertId, None, stats.iDuplicate)
             return False
 
-        self.tasks.addTask(partial(self._dispatchMsgObj, mobj))
+        return self._queueDispatch(mobj)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Dispatch Queue
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    # Messages queued for dispatch are appended to _dispatchQ, drained in
+    # FIFO order by a single task.  Each pass of the task manager, the
+    # drain dispatches at most dispatchBatchSize messages, stopping early
+    # after dispatchTimeBudget seconds, so timers get their turn.
+    dispatchBatchSize = 256
+    dispatchTimeBudget = 0.005
+    timestamp = staticmethod(timestamp)
+    _drainScheduled = False
+
+    def setDispatchBatch(self, batchSize=None, timeBudget=None):
+        if batchSize is not None:
+            self.dispatchBatchSize = batchSize
+        if timeBudget is not None:
+            self.dispatchTimeBudget = timeBudget
+
+    def _queueDispatch(self, mobj):
+        # deque.append is atomic; only scheduling the drain takes the lock,
+        # and the drain clears _drainScheduled under the same lock after
+        # seeing the queue empty, so exactly one drain task is ever queued
+        self._dispatchQ.append(mobj)
+        if not self._drainScheduled:
+            with self._lockDrain:
+                if self._drainScheduled:
+                    return True
+                self._drainScheduled = True
+            self.tasks.addTask(self._drainDispatchQ)
         return True
 
-    pktDecoders = {}
-    pktDecoders.update(msgDecoderMap)
+    def _drainDispatchQ(self):
+        q = self._dispatchQ
+        popleft = q.popleft
+        dispatch = self._dispatchMsgObj
+        timestamp = self.timestamp
+        tsEnd = timestamp() + self.dispatchTimeBudget
+
+        n = self.dispatchBatchSize
+        while q and n > 0:
+            with localtb:
+                dispatch(popleft())
+            n -= 1
+            if timestamp() > tsEnd:
+                break
+
+        if not q:
+            with self._lockDrain:
+                if not q:
+                    self._drainScheduled = False
+                    return None
+
+        # more to dispatch; returning the task runs it again next pass
+        return self._drainDispatchQ
+
+    pktCodecs = {}
+    pktCodecs.update(msgCodecMap)
+
+    # Packets for adverts without a local entry can only be acted upon
+    # through a forward command's fwdAdvertId, so dropping them early is
+    # opt-in for hosts that never relay toward named adverts.
+    dropUnknownAdverts = False
+
     def queuePacket(self, pkt):
-        pktDecoder = self.pktDecoders.get(pkt.packet[:1])
-        if pktDecoder is not None:
-            # supported packet, add it
-            mobj = pktDecoder(pkt)
-            self.queueMsg(mobj)
+        if pkt.packet[:1] == msgBundleVersion:
+            return self.queueBundle(pkt)
+        return self._queueCodecPacket(pkt)
+
+    def queueBundle(self, pkt):
+        try:
+            packets = splitBundle(pkt.packet)
+        except ValueError:
+            # malformed bundle from the wire; drop all of it
+            return False
+
+        queuePacket = self._queueCodecPacket
+        n = 0
+        for packet in packets:
+            if queuePacket(pkt.copy().update(packet=packet)):
+                n += 1
+        return n > 0
+
+    def _queueCodecPacket(self, pkt):
+        packet = pkt.packet
+        codec = self.pktCodecs.get(packet[:1])
+        if codec is None:
+            # unsupported packet version
+            return False
+
+        hdr = codec.peekHeader(packet)
+        if hdr is None:
+            return False
+
+        version, msgId, advertId = hdr
+        stats = self.stats
+        route = pkt.recvRoute
+        stats.count(advertId, route, stats.iReceived)
+        if self.msgFilter(advertId, msgId):
+            stats.count(advertId, route, stats.iDuplicate)
+            return False
+        if self.dropUnknownAdverts and advertId not in self.advertDb:
+            stats.count(advertId, route, stats.iUnhandled)
+            return False
+
+        # supported and unseen packet, decode it
+        mobj = codec.newDecoder(pkt)
+        stats.count(advertId, route, stats.iDecoded)
+        return self._queueDispatch(mobj)
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
@@ -63,9 +211,24 @@ class MessageMgr(IMessageAPI):
         mx = self.MsgQDispatch()
         mobj.executeOn(mx)
 
+        mctx = mx.mctx
+        if mctx is not None:
+            stats = self.stats
+            if mctx.handled:
+                field = stats.iDispatched
+            else: field = stats.iUnhandled
+            stats.count(mctx.advertId, mctx.src.recvRoute, field)
+
+        pool = getattr(mobj, 'pool', None)
+        if pool is not None:
+            # responders may keep mctx.src.mobj, so only recycle messages
+            # that no responder was handed
+            if mctx is None or not mctx.exposed:
+                pool.release(mobj)
+
     MsgQDispatch = MsgDispatch
     def _cfgFlyweights(self):
-        ns = dict(host=self.host, advertDb = self.advertDb)
+        ns = dict(host=self.host, advertDb = self.advertDb, stats=self.stats, tasks=self.tasks)
         self.MsgQDispatch = self.MsgQDispatch.newFlyweight(**ns)
 
         ns = dict(_msgs_=weakref.proxy(self))
@@ -14,7 +14,7 @@ from ..base import PacketNS
 
 from ..adverts import advertIdForNS
 from .apiMsgExecute import MsgExecuteAPI
-from .msgSizer import MsgSizer
+from .msgSizer import MsgSizer, MsgCmdSizes
 from .msgPPrint import MsgPPrint
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -47,10 +47,12 @@ class MsgCommandObject(MsgExecuteAPI):
         return klass(False)
 
     def copy(self):
+        # copies of a sealed message are a new message, so get a new msgId
+        msgId = self.msgId if not self.sealed else None
         r = self.new()
-        r.advertMsgId(self.advertId, self.msgId, self.src)
+        r.advertMsgId(self.advertId, msgId, self.src)
         r._cmdList = self._cmdList[:]
-        r._cmdCache = {}
+        r._cmdSize = self._cmdSize
         return r
 
     def __enter__(self):
@@ -75,6 +77,13 @@ class MsgCommandObject(MsgExecuteAPI):
     def encode(self, assign=False):
         return self.codec.encode(self, assign)
 
+    @classmethod
+    def encodeMany(klass, mobjs, assign=False):
+        return klass.codec.encodeMany(mobjs, assign)
+
+    def compileTemplate(self):
+        return self.codec.compileTemplate(self)
+
     def encodedAs(self, msgId, pkt):
         self.msgId = msgId
         self.fwd.update(pkt)
@@ -82,9 +91,28 @@ class MsgCommandObject(MsgExecuteAPI):
     def getFwdPacket(self, assign=True):
         fwd = self.fwd
         if fwd.packet is None:
+            if assign:
+                # commands cannot be added once sealed, so apply the
+                # default forwarding that sending would have added
+                self.autoForward()
             fwd = self.encode(assign)
+            if assign:
+                self.sealed = True
         return fwd.packet
 
+    # Once encoded for sending, the packet is shared by every forward and
+    # resend.  Sealing applies autoForward, and builder methods on a sealed
+    # message raise ValueError; use copy() for a modifiable message with a
+    # new msgId.
+    sealed = False
+    def seal(self):
+        self.getFwdPacket(True)
+        return self
+
+    def _checkMutable_(self):
+        if self.sealed:
+            raise ValueError("Cannot modify a sealed message; modify a copy() instead")
+
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
     def advertNS(self, advertNS, msgId=None):
@@ -96,6 +124,8 @@ class MsgCommandObject(MsgExecuteAPI):
     def getAdvertId(self):
         return self._advertId
     def setAdvertId(self, advertId):
+        if self.sealed:
+            raise ValueError("Cannot change the advertId of a sealed message")
         self._advertId = advertId
         self._cmd_clear_()
     advertId = property(getAdvertId, setAdvertId)
@@ -135,7 +165,9 @@ class MsgCommandObject(MsgExecuteAPI):
 
     def enqueSendOn(self, msgapi):
         self.ensureMsgId()
-        self.autoForward()
+        if not self.sealed:
+            # sealed messages had autoForward applied when sealed
+            self.autoForward()
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     #~ Msg Builder Interface
@@ -155,8 +187,7 @@ class MsgCommandObject(MsgExecuteAPI):
             fwdAdvertId = None
         if breadthLimit in ('*', None, 'all'): 
             breadthLimit = 0
-        self._cmd_('forwardOnce', breadthLimit, whenUnhandled, fwdAdvertId)
-        return self
+        return self._cmd_('forwardOnce', breadthLimit, whenUnhandled, fwdAdvertId)
 
     def broadcast(self, whenUnhandled=True, fwdAdvertId=None):
         return self.forward(0, whenUnhandled, fwdAdvertId)
@@ -167,27 +198,23 @@ class MsgCommandObject(MsgExecuteAPI):
             fwdAdvertId = None
         if breadthLimit in ('*', None, 'all'): 
             breadthLimit = 0
-        self._cmd_('forward', breadthLimit, whenUnhandled, fwdAdvertId)
-        return self
+        return self._cmd_('forward', breadthLimit, whenUnhandled, fwdAdvertId)
 
     def replyRef(self, replyAdvertIds):
-        self._cmd_clear_('replyRef')
-        if not replyAdvertIds: return
+        mobj = self._cmd_clear_('replyRef')
+        if not replyAdvertIds: return mobj
         if isinstance(replyAdvertIds, str):
             replyAdvertIds = [replyAdvertIds]
-        self._cmd_('replyRef', replyAdvertIds)
-        return self
+        return mobj._cmd_('replyRef', replyAdvertIds)
 
     def adRefs(self, advertIds, key=None):
         if not advertIds: return
-        self._cmd_('adRefs', advertIds, key)
-        return self
+        return self._cmd_('adRefs', advertIds, key)
 
     def msg(self, body, fmt=0, topic=None):
         if isinstance(topic, unicode):
             raise ValueError("Topic may not be unicode")
-        self._cmd_('msg', body, fmt, topic)
-        return self
+        return self._cmd_('msg', body, fmt, topic)
     
     def end(self):
         self._cmd_('end')
@@ -203,35 +230,60 @@ class MsgCommandObject(MsgExecuteAPI):
     def executeOn(self, mxRoot):
         mx = mxRoot.advertMsgId(self.advertId, self.msgId, self.src)
         if mx:
-            for fn, args in self.iterCmds():
-                r = mx.cmdPerform(fn, args)
-                if r is False:
+            cmdFns = mx.cmdFunctions()
+            for fn, args in self._cmdList:
+                if cmdFns[fn](mx, *args) is False:
                     break
 
             return mx.complete()
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-    _cmd_order = {'end':100, 'forward':90, 'msg': 50, 'adRefs': 30, 'replyRef': 30}
+    # _cmdList is kept in this order as commands are added, stable for
+    # commands of equal order, so playback never needs to sort
+    _cmd_order = {'end':100, 'forward':90, 'forwardOnce':90, 'msg': 50, 'adRefs': 30, 'replyRef': 30}
     def listCmds(self, bSorted=True):
-        cmdOrderMap = self._cmd_order
+        return self._cmdList
+    def iterCmds(self, bSorted=True):
+        return iter(self._cmdList)
 
+    def _cmdInsertIdx_(self, name):
+        cmdOrder = self._cmd_order
+        order = cmdOrder[name]
         cmdList = self._cmdList
-        if bSorted and cmdOrderMap:
-            cmdList = sorted(cmdList, key=lambda (cmd, args):cmdOrderMap[cmd])
-
-        return cmdList
-    def iterCmds(self, bSorted=True):
-        return iter(self.listCmds(bSorted))
+        idx = len(cmdList)
+        while idx and cmdOrder[cmdList[idx-1][0]] > order:
+            idx -= 1
+        return idx
 
     def _cmd_(self, name, *args):
+        self._checkMutable_()
+
         if self.fwd is not None:
             self.fwd.packet = None
 
-        ce = (name, args)
-        self._cmdCache.clear()
-        self._cmdList.append(ce)
-        return ce
+        self._cmdList.insert(self._cmdInsertIdx_(name), (name, args))
+        self._cmdSize += getattr(self.cmdSizes, name)(*args)
+        return self
+
+    def _cmd_replace_(self, idx, name, *args):
+        self._checkMutable_()
+
+        if self.fwd is not None:
+            self.fwd.packet = None
+
+        cmdSizes = self.cmdSizes
+        oldName, oldArgs = self._cmdList[idx]
+        self._cmdSize -= getattr(cmdSizes, oldName)(*oldArgs)
+
+        cmdOrder = self._cmd_order
+        if cmdOrder[name] == cmdOrder[oldName]:
+            self._cmdList[idx] = (name, args)
+        else:
+            del self._cmdList[idx]
+            self._cmdList.insert(self._cmdInsertIdx_(name), (name, args))
+        self._cmdSize += getattr(cmdSizes, name)(*args)
+        return self
     
     def _findCmds_(self, *cmds):
         for fn, args in self.iterCmds(False):
@@ -240,28 +292,36 @@ class MsgCommandObject(MsgExecuteAPI):
         else: return None
 
     def _cmd_clear_(self, name=None):
+        self._checkMutable_()
+
         if self.fwd is not None:
             self.fwd.packet = None
-        self._cmdCache = {}
         if name is None:
             self._cmdList = []
+            self._cmdSize = 0
         else:
             self._cmdList[:] = [(n,a) for n,a in self._cmdList if n != name]
+            cmdSizes = self.cmdSizes
+            self._cmdSize = sum(getattr(cmdSizes, n)(*a) for n,a in self._cmdList)
+        return self
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+    # running size of the commands in _cmdList, maintained by _cmd_
+    cmdSizes = MsgCmdSizes
+    _cmdSize = 0
+
     def __len__(self):
-        return self.size
+        return self.getSize()
 
     def getSize(self):
-        size = self._cmdCache.get('size', None)
-        if size is None:
-            size = self.calcSize(True)
-            self._cmdCache['size'] = size
-
-        return size
+        return self.cmdSizes.header(self.advertId) + self._cmdSize
     size = property(getSize)
 
+    def fitsIn(self, mtu):
+        """True if the encoded message is at most mtu bytes"""
+        return self.getSize() <= mtu
+
     def calcSize(self, incProtocol=True):
         mx = MsgSizer(incProtocol)
         return self.executeOn(mx)
@@ -0,0 +1,264 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from ..base import PacketNS
+
+from .apiMsgExecute import MsgExecuteAPI
+from .msgSizer import MsgCmdSizes
+from .msgCommand import MsgCommandObject
+from .msgObject import defaultCodec
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgCompactObject(MsgExecuteAPI):
+    """Slotted message object for high-rate senders.
+
+    Commands are held as one tuple of (name, args) tuples in canonical
+    order, and the encoded packet is the only other state.  Objects from a
+    MsgCompactPool are returned to the pool once MessageMgr has dispatched
+    them, so do not keep references to a pooled message after sending it.
+    Messages dispatched to any local responder are not returned, since the
+    responder may keep mctx.src.mobj."""
+
+    __slots__ = ('advertId', 'msgId', 'cmds', 'packet', 'pool')
+
+    codec = defaultCodec
+    cmdSizes = MsgCmdSizes
+    _cmd_order = MsgCommandObject._cmd_order
+    newPacketNS = PacketNS.new
+
+    def __init__(self, advertId=None, replyId=None, pool=None):
+        self.pool = pool
+        self.reset(advertId, replyId)
+
+    def reset(self, advertId=None, replyId=None):
+        self.advertId = advertId
+        self.msgId = None
+        self.cmds = ()
+        self.packet = None
+        if replyId:
+            self.replyRef(replyId)
+        return self
+
+    def __repr__(self):
+        return '<%s msgId: %s advertId: %s>' % (self.__class__.__name__, self.hexMsgId, self.hexAdvertId)
+
+    hexAdvertId = property(lambda self:(self.advertId or '').encode('hex') or None)
+    hexMsgId = property(lambda self:(self.msgId or '').encode('hex') or None)
+
+    def copy(self):
+        r = self.__class__(self.advertId, pool=self.pool)
+        r.msgId = self.msgId
+        r.cmds = self.cmds
+        return r
+
+    def __enter__(self):
+        """Enables use of a MsgCompactObject as a template"""
+        return self.copy()
+
+    def __exit__(self, etype, exc, tb):
+        pass
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def encode(self, assign=False):
+        return self.codec.encode(self, assign)
+
+    def encodedAs(self, msgId, pkt):
+        self.msgId = msgId
+        self.packet = pkt.packet
+
+    def getFwdPacket(self, assign=True):
+        packet = self.packet
+        if packet is None:
+            packet = self.encode(assign).packet
+        return packet
+
+    def ensureMsgId(self):
+        msgId = self.msgId
+        if msgId is None:
+            msgId = self.codec.newMsgId()
+            self.msgId = msgId
+        return msgId
+
+    def getReplyId(self):
+        for name, args in self.cmds:
+            if name == 'replyRef':
+                return args[0][0]
+    replyId = property(getReplyId)
+
+    def isForwarded(self):
+        for name, args in self.cmds:
+            if name in ('forward', 'forwardOnce'):
+                return True
+        return False
+    def autoForward(self):
+        if not self.isForwarded(): 
+            if self.replyId != self.advertId:
+                self.forward()
+            else: self.broadcast()
+        return self
+
+    def enqueSendOn(self, msgapi):
+        self.ensureMsgId()
+        self.autoForward()
+
+    def send(self):
+        msgs = getattr(self.pool, 'msgs', None)
+        if msgs is None:
+            raise ValueError("%r is not bound to a MessageMgr; use MessageMgr.sendMsg" % (self,))
+        return msgs.sendMsg(self)
+
+    def release(self):
+        pool = self.pool
+        if pool is not None:
+            pool.release(self)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Msg Builder Interface
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def advertMsgId(self, advertId, msgId=None, src=None):
+        self.advertId = advertId
+        self.msgId = msgId
+        self.cmds = ()
+        self.packet = src.packet if src is not None else None
+        return self
+
+    def forwardOnce(self, breadthLimit=1, whenUnhandled=True, fwdAdvertId=None):
+        if fwdAdvertId in (True, False):
+            fwdAdvertId = None
+        if breadthLimit in ('*', None, 'all'): 
+            breadthLimit = 0
+        return self._cmd_('forwardOnce', breadthLimit, whenUnhandled, fwdAdvertId)
+
+    def noForward(self):
+        return self.forward(-1, True, None)
+    def forward(self, breadthLimit=1, whenUnhandled=True, fwdAdvertId=None):
+        if fwdAdvertId in (True, False):
+            fwdAdvertId = None
+        if breadthLimit in ('*', None, 'all'): 
+            breadthLimit = 0
+        return self._cmd_('forward', breadthLimit, whenUnhandled, fwdAdvertId)
+
+    def replyRef(self, replyAdvertIds):
+        self.packet = None
+        self.cmds = tuple(ce for ce in self.cmds if ce[0] != 'replyRef')
+        if not replyAdvertIds: return self
+        if isinstance(replyAdvertIds, str):
+            replyAdvertIds = [replyAdvertIds]
+        return self._cmd_('replyRef', replyAdvertIds)
+
+    def adRefs(self, advertIds, key=None):
+        if not advertIds: return
+        return self._cmd_('adRefs', advertIds, key)
+
+    def msg(self, body, fmt=0, topic=None):
+        if isinstance(topic, unicode):
+            raise ValueError("Topic may not be unicode")
+        return self._cmd_('msg', body, fmt, topic)
+    
+    def end(self):
+        self._cmd_('end')
+        return False
+
+    def complete(self):
+        return self
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Utility and Playback
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def executeOn(self, mxRoot):
+        src = self.newPacketNS(self.packet, mobj=self)
+        mx = mxRoot.advertMsgId(self.advertId, self.msgId, src)
+        if mx:
+            cmdFns = mx.cmdFunctions()
+            for fn, args in self.cmds:
+                if cmdFns[fn](mx, *args) is False:
+                    break
+
+            return mx.complete()
+
+    def listCmds(self, bSorted=True):
+        return list(self.cmds)
+    def iterCmds(self, bSorted=True):
+        return iter(self.cmds)
+
+    def _cmd_(self, name, *args):
+        self.packet = None
+
+        cmdOrder = self._cmd_order
+        order = cmdOrder[name]
+        cmds = self.cmds
+        idx = len(cmds)
+        while idx and cmdOrder[cmds[idx-1][0]] > order:
+            idx -= 1
+        self.cmds = cmds[:idx] + ((name, args),) + cmds[idx:]
+        return self
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def __len__(self):
+        return self.getSize()
+
+    def getSize(self):
+        cmdSizes = self.cmdSizes
+        size = cmdSizes.header(self.advertId)
+        for name, args in self.cmds:
+            size += getattr(cmdSizes, name)(*args)
+        return size
+    size = property(getSize)
+
+    def fitsIn(self, mtu):
+        return self.getSize() <= mtu
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgCompactPool(object):
+    """Free-list of MsgCompactObject instances bound to a MessageMgr"""
+
+    MsgCompactObject = MsgCompactObject
+    maxFree = 4096
+
+    def __init__(self, msgs=None, maxFree=None):
+        self.msgs = msgs
+        if maxFree is not None:
+            self.maxFree = maxFree
+        self.free = []
+
+    def __len__(self):
+        return len(self.free)
+
+    def newMsg(self, advertId=None, replyId=None):
+        try:
+            mobj = self.free.pop()
+        except IndexError:
+            return self.MsgCompactObject(advertId, replyId, self)
+        return mobj.reset(advertId, replyId)
+
+    def release(self, mobj):
+        # cmds is None only while on the free-list, guarding double releases
+        if mobj.pool is not self or mobj.cmds is None:
+            return False
+
+        free = self.free
+        if len(free) >= self.maxFree:
+            return False
+
+        mobj.reset()
+        mobj.cmds = None
+        free.append(mobj)
+        return True
+
@@ -13,6 +13,7 @@
 from .msgCommand import MsgCommandObject
 from ..adverts import advertIdForNS
 from . import packet_v02
+from . import packet_v03
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Mapping Values
@@ -20,15 +21,19 @@ from . import packet_v02
 
 msgCodecList = [
     packet_v02.MsgObject,
+    packet_v03.MsgObject,
     ]
 
 msgDecoderMap = dict((e.codec.msgVersion, e.codec.newDecoder) for e in msgCodecList)
+msgCodecMap = dict((e.codec.msgVersion, e.codec) for e in msgCodecList)
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class MsgObject(MsgCommandObject):
     pass
 
-defaultCodec = msgCodecList[-1].codec
+# v03 is decoded on receive, but sending stays on v02 until all peers
+# understand v03; use packet_v03.MsgObject to send v03 explicitly.
+defaultCodec = packet_v02.MsgObject.codec
 defaultCodec = defaultCodec.new(MsgObject)
 
@@ -11,6 +11,7 @@
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 from .apiMsgExecute import MsgExecuteAPI
+from .bodyCodec import EncodedBody
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
@@ -69,20 +70,25 @@ class MsgSizer(MsgExecuteAPI):
         self.incProtocol(2, fwdAdvertId)
 
     def adRefs(self, advertIds, key=None):
-        if key is True:
+        if key is True or key is None:
             self.incProtocol(1, advertIds)
         else:
-            self.incProtocol(1, key, advertIds)
+            # key is prefixed by its length
+            self.incProtocol(2, key, advertIds)
 
     def msg(self, body, fmt=0, topic=None):
         self.incProtocol(3)
+        if isinstance(body, EncodedBody):
+            # body codec command
+            self.incProtocol(1)
         if isinstance(topic, (int, long)):
             self.incPayload(body, 4)
-        elif isinstance(topic, basestring):
+        elif topic and isinstance(topic, basestring):
             self.incProtocol(2)
             self.incPayload(body, topic)
         else:
-            self.incPayload(body, topic)
+            # empty and None topics encode as no topic
+            self.incPayload(body)
 
     def end(self):
         self.incProtocol(1)
@@ -90,3 +96,51 @@ class MsgSizer(MsgExecuteAPI):
     def complete(self):
         return self.getSize()
 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgCmdSizes(object):
+    """Per command sizes matching MsgSizer totals, computed directly from
+    the command arguments so MsgCommandObject can keep a running size.
+
+    Bodies a codec's body codec compresses while encoding are counted at
+    their plain size, which bounds the compressed body and its codec
+    command byte."""
+
+    msgIdLen = MsgSizer.msgIdLen
+
+    @classmethod
+    def header(klass, advertId):
+        return 1 + klass.msgIdLen + (len(advertId) if advertId else 0)
+
+    @staticmethod
+    def forwardOnce(breadthLimit=1, whenUnhandled=True, fwdAdvertId=None):
+        return 0
+    @staticmethod
+    def forward(breadthLimit=1, whenUnhandled=True, fwdAdvertId=None):
+        return 2 + (len(fwdAdvertId) if fwdAdvertId else 0)
+
+    @staticmethod
+    def adRefs(advertIds, key=None):
+        n = 1 + 16*len(advertIds)
+        if key is True or key is None:
+            return n
+        return n + 1 + len(key)
+    @staticmethod
+    def replyRef(replyAdvertIds):
+        return 1 + 16*len(replyAdvertIds)
+
+    @staticmethod
+    def msg(body, fmt=0, topic=None):
+        n = 3 + len(body)
+        if isinstance(body, EncodedBody):
+            n += 1
+        if isinstance(topic, (int, long)):
+            return n + 4
+        elif topic and isinstance(topic, basestring):
+            return n + 2 + len(topic)
+        return n
+
+    @staticmethod
+    def end():
+        return 1
+
@@ -12,6 +12,7 @@
 
 import os
 from hashlib import md5
+from itertools import chain
 
 from ...base import PacketNS
 from ...adverts import advertIdForNS, AdvertIdStr
@@ -33,6 +34,18 @@ def iterMsgId(count, seed=None):
         h.update(h.digest())
         yield MsgIdStr(h.digest()[:count])
 
+def iterMsgIdBlocks(count, blockSize=512, urandom=os.urandom):
+    """Yields lists of blockSize msgIds sliced from one urandom read"""
+    n = count*blockSize
+    while 1:
+        block = urandom(n)
+        yield map(MsgIdStr, [block[i:i+count] for i in xrange(0, n, count)])
+
+def iterMsgIdPool(count, blockSize=512):
+    """Pooled msgId iterator; use iterMsgIdPool(count).next in place of
+    iterMsgId(count).next"""
+    return chain.from_iterable(iterMsgIdBlocks(count, blockSize))
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class MsgCodecBase(object):
@@ -57,6 +70,9 @@ class MsgCodecBase(object):
         decoder = self.newDecoder(src)
         return decoder.executeOn(mx)
 
+    def peekHeader(self, packet):
+        raise NotImplementedError('Subclass Responsibility: %r' % (self,))
+
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
     def encode(self, mobj, assign=False):
@@ -69,6 +85,39 @@ class MsgCodecBase(object):
             mobj.encodedAs(encoder.msgId, pkt)
         return pkt
 
+    def encodeMany(self, mobjs, assign=False):
+        """Encodes mobjs through one reused encoder and output buffer,
+        returning a list of packet strs"""
+        encoder = self.newEncoder()
+        encoder.complete = encoder.completePacket
+        newPacketNS = encoder.newPacketNS
+
+        result = []
+        for mobj in mobjs:
+            encoder.reset()
+            packet = mobj.executeOn(encoder)
+            if not isinstance(packet, str):
+                raise RuntimeError("Packet is not of type str: %s" % (type(packet),))
+
+            if assign:
+                mobj.encodedAs(encoder.msgId, newPacketNS(packet))
+            result.append(packet)
+        return result
+
+    def compileTemplate(self, mobj):
+        bodyCodec = getattr(self.newEncoder, 'bodyCodec', None)
+        return self.newTemplate(mobj, bodyCodec)
+
+    def setBodyCodec(self, bodyCodec):
+        """Compress msg bodies encoded by this codec with bodyCodec, or
+        stop compressing when bodyCodec is None"""
+        Encoder = type(self).newEncoder
+        if bodyCodec is not None:
+            name = '%s_%s' % (Encoder.__name__, bodyCodec.__class__.__name__)
+            Encoder = type(Encoder)(name, (Encoder,), dict(bodyCodec=bodyCodec))
+        self.newEncoder = Encoder
+        return Encoder
+
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
     def newMsgCommandObject(self):
@@ -77,6 +126,8 @@ class MsgCodecBase(object):
         raise NotImplementedError('Subclass Responsibility: %r' % (self,))
     def newDecoder(self, src):
         raise NotImplementedError('Subclass Responsibility: %r' % (self,))
+    def newTemplate(self, mobj, bodyCodec=None):
+        raise NotImplementedError('Subclass Responsibility: %r' % (self,))
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
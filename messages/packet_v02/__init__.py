@@ -30,7 +30,7 @@ Routing and Delivery Commands:
 
     0bR000 ---- :: End boundry
     0bR001 ffff :: Forward
-    0bR010 ---- :: XXX Unused
+    0bR010 cccc :: Body codec, the next msg command's body is encoded with body codec cccc
     0bR011 ---- :: XXX Unused
 
     0bR100 nnnn :: AdvertId references, nnnn+1 references
@@ -64,6 +64,8 @@ Messaging Commands:
 from .msgObject import MsgObject_v02, MsgObject, MsgCodec
 from .encode import MsgEncoder_v02, MsgEncoder
 from .decode import MsgDecoder_v02, MsgDecoder
+from .decodeBuffer import MsgBufferDecoder_v02, MsgBufferDecoder
+from .template import MsgTemplate_v02, MsgTemplate
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
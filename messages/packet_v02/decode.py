@@ -15,6 +15,7 @@ from StringIO import StringIO
 
 from ..packet_base import AdvertIdStr, MsgIdStr, PacketNS
 from ..msgPPrint import MsgPPrint
+from ..bodyCodec import bodyCodecFor, EncodedBodyMsg
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
@@ -28,6 +29,10 @@ class CommamdDispatch(dict):
             return fn
         return register
 
+    def table(self):
+        """Returns handlers as a list indexed by the 4-bit command opcode"""
+        return [self.get(ci) for ci in xrange(16)]
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 class MsgDecoder_v02(object):
@@ -110,7 +115,18 @@ class MsgDecoder_v02(object):
 
         mx.forward(breadthLimit, whenUnhandled, fwdAdvertId)
 
-    @cmds.add('0010', '0011')
+    @cmds.add('0010')
+    def cmd_bodyCodec(self, cmd, codecId, tip, mx):
+        # the following msg command's body is encoded with codecId
+        bodyMx = EncodedBodyMsg(mx, bodyCodecFor(codecId))
+        e = self.nextCmd(tip)
+        if e is None or e[1] < 0x8:
+            raise ValueError("Body codec command must precede a msg command")
+
+        cmdFn, cmdId, flags = e
+        return cmdFn(self, cmdId, flags, tip, bodyMx)
+
+    @cmds.add('0011')
     def cmd_unused(self, cmd, flags, tip, mx):
         raise NotImplementedError('Unused: %r' % ((cmd, flags, tip, mx),))
 
@@ -166,18 +182,19 @@ class MsgDecoder_v02(object):
         (int(k, 2), (fmt, lambda tip,fmt=fmt,n=calcsize(fmt): unpack(fmt, tip.read(n))))
             for k,fmt in _msgUnpackFmt.items())
 
+    # pre-bound unpackers indexed by msg command opcode
+    _msgUnpack = [None]*8 + [_msgUnpackFmt[ci][1] for ci in xrange(8, 16)]
+
     @cmds.add('1000')
     def cmd_msg(self, cmd, fmt, tip, mx):
-        msgFmt, msgFmtUnpack = self._msgUnpackFmt[cmd]
-        bodyLen, = msgFmtUnpack(tip)
+        bodyLen, = self._msgUnpack[cmd](tip)
         topic = None
         body = tip.read(bodyLen)
         mx.msg(body, fmt, topic)
 
     @cmds.add('1001')
     def cmd_msgTopicStr(self, cmd, fmt, tip, mx):
-        msgFmt, msgFmtUnpack = self._msgUnpackFmt[cmd]
-        bodyLen, topicLen = msgFmtUnpack(tip)
+        bodyLen, topicLen = self._msgUnpack[cmd](tip)
         topic = tip.read(topicLen)
         body = tip.read(bodyLen)
         mx.msg(body, fmt, topic)
@@ -188,11 +205,11 @@ class MsgDecoder_v02(object):
 
     @cmds.add('1100', '1101', '1110', '1111')
     def cmd_msgTopicId(self, cmd, fmt, tip, mx):
-        msgFmt, msgFmtUnpack = self._msgUnpackFmt[cmd]
-        bodyLen, topic = msgFmtUnpack(tip)
+        bodyLen, topic = self._msgUnpack[cmd](tip)
         body = tip.read(bodyLen)
         mx.msg(body, fmt, topic)
 
+    cmdTable = cmds.table()
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     #~ Utility and Playback
@@ -210,9 +227,15 @@ class MsgDecoder_v02(object):
 
         mx = mxRoot.advertMsgId(advertId, msgId, self.src)
         if mx:
-            for cmdFn, cmdId, flags in self.iterCmds(tip):
-                r = cmdFn(self, cmdId, flags, tip, mx)
-                if r is False:
+            cmdTable = self.cmdTable
+            read = tip.read
+            while 1:
+                cmdId = read(1)
+                if not cmdId:
+                    break
+                cmdId = ord(cmdId)
+                cmd = cmdId >> 4
+                if cmdTable[cmd](self, cmd, cmdId & 0xf, tip, mx) is False:
                     break
 
             return mx.complete()
@@ -235,7 +258,7 @@ class MsgDecoder_v02(object):
         flags = cmdId & 0xf
         cmdId >>= 4
 
-        cmdFn = self.cmds[cmdId]
+        cmdFn = self.cmdTable[cmdId]
         return cmdFn, cmdId, flags
 
 MsgDecoder = MsgDecoder_v02
@@ -0,0 +1,194 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from struct import Struct
+
+from ..packet_base import AdvertIdStr, MsgIdStr
+from ..bodyCodec import bodyCodecFor, EncodedBodyMsg, MsgBodyRef
+from .decode import MsgDecoder_v02, CommamdDispatch
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgBufferDecoder_v02(MsgDecoder_v02):
+    """Single pass decoder that walks src.packet with an integer cursor.
+
+    Fields are read in place with precompiled Struct.unpack_from, and
+    advertIds and bodies are sliced out of the packet only as each command
+    is replayed onto mx.  The mx call sequence is identical to
+    MsgDecoder_v02.executeOn.  Executors with lazyMsgBody set receive
+    MsgBodyRef handles instead of body strs.
+
+    Command handlers take the cursor index just past the command byte and
+    return the index of the next command, or None to stop decoding.  They
+    are dispatched through cmdTable, a list indexed by the command opcode;
+    subclasses that add to cmds must rebuild it with cmds.table()."""
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Routing and Delivery Commands
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    cmds = CommamdDispatch()
+
+    @cmds.add('0000')
+    def cmd_end(self, cmd, flags, pkt, i, mx):
+        mx.end()
+        return None
+
+    _fwdBreadth = [None, 1, -1]
+
+    @cmds.add('0001')
+    def cmd_forward(self, cmd, flags, pkt, i, mx):
+        breadthLimit = (flags & 0x3)
+        if breadthLimit == 3:
+            breadthLimit = (ord(pkt[i]) & 0xf) + 1
+            i += 1
+        else:
+            breadthLimit = self._fwdBreadth[breadthLimit]
+
+        whenUnhandled = bool(flags & 0x4)
+
+        if flags & 0x8:
+            # includes advertId to forward toward
+            fwdAdvertId = AdvertIdStr(pkt[i:i+16])
+            i += 16
+        else: fwdAdvertId = None
+
+        mx.forward(breadthLimit, whenUnhandled, fwdAdvertId)
+        return i
+
+    @cmds.add('0010')
+    def cmd_bodyCodec(self, cmd, codecId, pkt, i, mx):
+        # the following msg command's body is encoded with codecId
+        bodyMx = EncodedBodyMsg(mx, bodyCodecFor(codecId))
+        cmdId = ord(pkt[i:i+1] or '\0')
+        cmd = cmdId >> 4
+        if cmd < 0x8:
+            raise ValueError("Body codec command must precede a msg command")
+        return self.cmdTable[cmd](self, cmd, cmdId & 0xf, pkt, i+1, bodyMx)
+
+    @cmds.add('0011', '0111')
+    def cmd_unused(self, cmd, flags, pkt, i, mx):
+        raise NotImplementedError('Unused: %r' % ((cmd, flags, i, mx),))
+
+    @cmds.add('0100', '0101')
+    def cmd_adRefs(self, cmd, flags, pkt, i, mx):
+        if cmd & 0x1:
+            iKey = i + 1
+            i = iKey + ord(pkt[i])
+            key = pkt[iKey:i]
+        else: key = None
+
+        count = flags + 1 # [0..15] => [1..16]
+        advertIds, i = self._readAdvertIds(pkt, i, count)
+        mx.adRefs(advertIds, key)
+        return i
+
+    @cmds.add('0110')
+    def cmd_replyRef(self, cmd, flags, pkt, i, mx):
+        count = flags + 1 # [0..15] => [1..16]
+        advertIds, i = self._readAdvertIds(pkt, i, count)
+        mx.replyRef(advertIds)
+        return i
+
+    def _readAdvertIds(self, pkt, i, count):
+        iEnd = i + 16*count
+        advertIds = [AdvertIdStr(pkt[e:e+16]) for e in xrange(i, iEnd, 16)]
+        return advertIds, iEnd
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Message and Topic Commands
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    # pre-bound (unpack_from, size) pairs indexed by msg command opcode
+    _msgUnpackFrom = [None]*8 + [
+        (lambda st: (st.unpack_from, st.size))(Struct(MsgDecoder_v02._msgUnpackFmt[ci][0]))
+            for ci in xrange(8, 16)]
+
+    @cmds.add('1000')
+    def cmd_msg(self, cmd, fmt, pkt, i, mx):
+        unpack_from, size = self._msgUnpackFrom[cmd]
+        bodyLen, = unpack_from(pkt, i)
+        i += size
+        iEnd = i + bodyLen
+        mx.msg(self.newBody(pkt, i, iEnd), fmt, None)
+        return iEnd
+
+    @cmds.add('1001')
+    def cmd_msgTopicStr(self, cmd, fmt, pkt, i, mx):
+        unpack_from, size = self._msgUnpackFrom[cmd]
+        bodyLen, topicLen = unpack_from(pkt, i)
+        i += size
+        iBody = i + topicLen
+        iEnd = iBody + bodyLen
+        mx.msg(self.newBody(pkt, iBody, iEnd), fmt, pkt[i:iBody])
+        return iEnd
+
+    @cmds.add('1010', '1011')
+    def cmd_msgUnused(self, cmd, fmt, pkt, i, mx):
+        raise NotImplementedError('Unused: %r' % ((cmd, fmt, i, mx),))
+
+    @cmds.add('1100', '1101', '1110', '1111')
+    def cmd_msgTopicId(self, cmd, fmt, pkt, i, mx):
+        unpack_from, size = self._msgUnpackFrom[cmd]
+        bodyLen, topic = unpack_from(pkt, i)
+        i += size
+        iEnd = i + bodyLen
+        mx.msg(self.newBody(pkt, i, iEnd), fmt, topic)
+        return iEnd
+
+    @staticmethod
+    def newBody(pkt, iStart, iEnd):
+        return pkt[iStart:iEnd]
+
+    cmdTable = cmds.table()
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Utility and Playback
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def executeOn(self, mxRoot):
+        src = self.src
+        pkt = src.packet
+
+        pktVersion = pkt[:1]
+        if pktVersion != self.msgVersion:
+            raise ValueError("Version mismatch! packet: %x class: %x" % (ord(pktVersion or '\0'), ord(self.msgVersion)))
+
+        i = 1 + self.msgIdLen
+        msgId = MsgIdStr(pkt[1:i])
+        advertId = AdvertIdStr(pkt[i:i+16])
+        i += 16
+
+        mx = mxRoot.advertMsgId(advertId, msgId, src)
+        if mx:
+            lazyMsgBody = mx.lazyMsgBody
+            if lazyMsgBody:
+                self.newBody = MsgBodyRef
+            try:
+                cmdTable = self.cmdTable
+                iEnd = len(pkt)
+                while i < iEnd:
+                    cmdId = ord(pkt[i])
+                    cmd = cmdId >> 4
+                    i = cmdTable[cmd](self, cmd, cmdId & 0xf, pkt, i+1, mx)
+                    if i is None:
+                        break
+            finally:
+                if lazyMsgBody:
+                    # restore the class newBody for the next executor
+                    del self.newBody
+
+            return mx.complete()
+
+MsgBufferDecoder = MsgBufferDecoder_v02
@@ -14,8 +14,9 @@ from functools import partial
 from struct import pack, unpack, calcsize
 from StringIO import StringIO
 
-from ..packet_base import MsgEncoderBase, iterMsgId
+from ..packet_base import MsgEncoderBase, iterMsgIdPool
 from ..apiMsgExecute import MsgExecuteAPI
+from ..bodyCodec import EncodedBody
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
@@ -27,7 +28,7 @@ class MsgEncoder_v02(MsgExecuteAPI, MsgEncoderBase):
     advertId = None
     msgId = None
     msgIdLen = 4
-    newMsgId = iterMsgId(msgIdLen).next
+    newMsgId = iterMsgIdPool(msgIdLen).next
 
     def getPacket(self):
         return self.tip.getvalue()
@@ -54,8 +55,15 @@ class MsgEncoder_v02(MsgExecuteAPI, MsgEncoderBase):
     #~ Msg Builder Interface
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+    tip = None
     def advertMsgId(self, advertId, msgId=None, src=None):
-        tip = StringIO()
+        tip = self.tip
+        if tip is None:
+            tip = StringIO()
+        else:
+            # reuse the output buffer of a previous packet
+            tip.seek(0)
+            tip.truncate()
         tip.write(self.msgVersion)
 
         if msgId: self.msgId = msgId
@@ -215,12 +223,36 @@ class MsgEncoder_v02(MsgExecuteAPI, MsgEncoderBase):
         if not (0 <= fmt <= 0xf):
             raise ValueError("Invalid format value: %r" % (fmt,))
 
+        body = self._msgBody(body)
         cmd, prefix = self._msgCmdPrefix(len(body), topic)
         self._writeCmd(cmd, fmt, prefix, body)
         return self
 
     def complete(self):
         return self.getPacketNS()
+    def completePacket(self):
+        return self.getPacket()
+
+    def reset(self):
+        self.advertId = None
+        self.msgId = None
+
+    # MsgBodyCodec used to compress msg bodies; see MsgCodecBase.setBodyCodec
+    bodyCodec = None
+
+    def _msgBody(self, body):
+        if not isinstance(body, EncodedBody):
+            bodyCodec = self.bodyCodec
+            if bodyCodec is None:
+                return body
+
+            body = bodyCodec.encodeBody(body)
+            if not isinstance(body, EncodedBody):
+                return body
+
+        # already encoded bodies, like those being forwarded, are written as-is
+        self._writeCmd(0x2, body.bodyCodec.codecId)
+        return body
 
     #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     #~ Utils
@@ -10,11 +10,13 @@
 #~ Imports 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-from ..packet_base import MsgCodecBase, iterMsgId
+from ..packet_base import MsgCodecBase, iterMsgId, MsgIdStr, AdvertIdStr
 from ..msgCommand import MsgCommandObject
 
 from .encode import MsgEncoder_v02
 from .decode import MsgDecoder_v02
+from .decodeBuffer import MsgBufferDecoder_v02
+from .template import MsgTemplate_v02
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Message Object, v02
@@ -23,9 +25,21 @@ from .decode import MsgDecoder_v02
 class MsgCodec_v02(MsgCodecBase):
     msgVersion = '\x02'
     newEncoder = MsgEncoder_v02
-    newDecoder = MsgDecoder_v02
+    newDecoder = MsgBufferDecoder_v02
+    newTemplate = MsgTemplate_v02
     newMsgId = MsgEncoder_v02.newMsgId
 
+    msgIdLen = MsgDecoder_v02.msgIdLen
+    headerLen = 1 + msgIdLen + 16
+    def peekHeader(self, packet):
+        """Returns (version, msgId, advertId) read from the fixed header
+        offsets, without building a decoder.  Returns None for packets
+        too short to hold a header."""
+        if len(packet) < self.headerLen:
+            return None
+        i = 1 + self.msgIdLen
+        return packet[:1], MsgIdStr(packet[1:i]), AdvertIdStr(packet[i:i+16])
+
 class MsgObject_v02(MsgCommandObject):
     pass
 
@@ -0,0 +1,139 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from struct import Struct
+
+from ..packet_base import PacketNS, MsgIdStr
+from ..bodyCodec import EncodedBody
+from .encode import MsgEncoder_v02
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgTemplateEncoder_v02(MsgEncoder_v02):
+    """Encoder that writes the single msg command with an empty body, and
+    records where that command sits in the packet"""
+
+    msgSlot = None
+    def msg(self, body, fmt=0, topic=None):
+        if self.msgSlot is not None:
+            raise ValueError("Message templates support exactly one msg command")
+
+        tip = self.tip
+        iCmd = tip.tell()
+        super(MsgTemplateEncoder_v02, self).msg('', fmt, topic)
+        self.msgSlot = (iCmd, tip.tell())
+        return self
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgTemplate_v02(object):
+    """Precompiled packet for a repeated message shape.
+
+    The advertId, routing commands, msg command prefix and topic are
+    encoded once.  Each new packet only patches in the msgId, body length
+    and body, and joins the precomputed segments.
+
+    Like MessageMgr.sendMsg, compiling applies autoForward to the copy of
+    the message object being compiled.  Bodies are compressed with
+    bodyCodec, the codec's body codec when compiled by compileTemplate, and
+    EncodedBody bodies are written with their body codec command."""
+
+    newEncoder = MsgTemplateEncoder_v02
+    newPacketNS = PacketNS.new
+    newMsgId = MsgEncoder_v02.newMsgId
+    msgIdLen = MsgEncoder_v02.msgIdLen
+    msgVersion = MsgEncoder_v02.msgVersion
+
+    packBodyLen = staticmethod(Struct('!H').pack)
+    bodyCodec = None
+
+    def __init__(self, mobj, bodyCodec=None):
+        if bodyCodec is not None:
+            self.bodyCodec = bodyCodec
+
+        mobj = mobj.copy()
+        mobj.msgId = None
+        mobj.autoForward()
+
+        msgCmds = [i for i, (name, args) in enumerate(mobj._cmdList) if name == 'msg']
+        if len(msgCmds) != 1:
+            raise ValueError("Message templates require exactly one msg command, found %s" % (len(msgCmds),))
+        self.iMsgCmd = msgCmds[0]
+        self.msgArgs = mobj._cmdList[self.iMsgCmd][1]
+        self.mobj = mobj
+
+        enc = self.newEncoder()
+        packet = mobj.executeOn(enc).packet
+        iCmd, iMsgEnd = enc.msgSlot
+
+        # [version][msgId][advertId ...][codec cmd][msg cmd][bodyLen][topic][body][tail]
+        iHead = 1 + self.msgIdLen
+        iTopic = iCmd + 1 + len(self.packBodyLen(0))
+        self.head = packet[iHead:iCmd]
+        self.msgCmd = packet[iCmd]
+        self.topic = packet[iTopic:iMsgEnd]
+        self.tail = packet[iMsgEnd:]
+
+    def __repr__(self):
+        return '<%s advertId: %s>' % (self.__class__.__name__, self.mobj.hexAdvertId)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def encode(self, body, msgId=None):
+        """Returns (msgId, packet) for body using this template"""
+        if msgId is None:
+            msgId = self.newMsgId()
+        elif len(msgId) != self.msgIdLen:
+            msgId = MsgIdStr(msgId[:self.msgIdLen])
+            if len(msgId) != self.msgIdLen:
+                raise ValueError("MsgId must have a least %s bytes" % (self.msgIdLen,))
+
+        body, codecCmd = self._encodeBody(body)
+        packet = ''.join([self.msgVersion, msgId, self.head, codecCmd, self.msgCmd,
+                    self.packBodyLen(len(body)), self.topic, body, self.tail])
+        return msgId, packet
+
+    def _encodeBody(self, body):
+        if not isinstance(body, EncodedBody):
+            bodyCodec = self.bodyCodec
+            if bodyCodec is None:
+                return body, ''
+            body = bodyCodec.encodeBody(body)
+            if not isinstance(body, EncodedBody):
+                return body, ''
+
+        # body codec command: 0b0010 cccc
+        return body, chr(0x20 | body.bodyCodec.codecId)
+
+    def packet(self, body, msgId=None):
+        return self.encode(body, msgId)[1]
+
+    def pkt(self, body, msgId=None):
+        return self.newPacketNS(self.packet(body, msgId))
+
+    def newMsg(self, body, msgId=None):
+        """Returns a copy of the template message object with body
+        substituted and its encoded packet already assigned"""
+        mobj = self.mobj.copy()
+        msgArgs = (body,) + self.msgArgs[1:]
+        mobj._cmd_replace_(self.iMsgCmd, 'msg', *msgArgs)
+
+        msgId, packet = self.encode(body, msgId)
+        mobj.encodedAs(msgId, self.newPacketNS(packet))
+        return mobj
+
+    def send(self, body, msgId=None):
+        return self.newMsg(body, msgId).send()
+
+MsgTemplate = MsgTemplate_v02
@@ -0,0 +1,70 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Decode micro-benchmarks; not collected by the unittest suites"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from TG.blathernet.base import PacketNS
+from TG.blathernet.messages import advertIdForNS, packet_v02 as packet, packet_v03
+from TG.blathernet.messages.apiMsgExecute import MsgExecuteAPI
+
+from .benchEncode import timed
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+advertId = advertIdForNS('benchDecode')
+adRefList = [advertIdForNS('benchDecode/%s' % i) for i in xrange(16)]
+
+class NullExecute(MsgExecuteAPI):
+    def advertMsgId(self, advertId, msgId=None, src=None):
+        return self
+
+def iterVectors(MsgObject=packet.MsgObject):
+    """Representative packets, following the encode/decode test vectors"""
+    def newMsg():
+        mobj = MsgObject(advertId)
+        mobj.msgId = '1357'
+        return mobj
+
+    yield 'empty', newMsg()
+    yield 'msg', newMsg().msg('a short message body')
+    yield 'forward+replyRef+msg', newMsg().forward().replyRef(adRefList[0]).msg('a telemetry body', 0, 'topic')
+    yield 'adRefs', newMsg().adRefs(adRefList[:4], 'key').adRefs(adRefList[4:8]).msg('x')
+    yield 'topics', (newMsg().msg('a', 1, 42).msg('b', 2, 'abcd')
+            .msg('c', 3, 'abcdefgh').msg('d', 4, adRefList[1]).msg('e', 5, 'a topic'))
+    yield 'large body', newMsg().forward().msg('z'*1000, 1, 'bulk')
+
+def benchDecoders(decoders, MsgObject, count=20000):
+    for name, mobj in iterVectors(MsgObject):
+        pkt = PacketNS(mobj.encode().packet)
+        print '%s (%s bytes):' % (name, len(pkt.packet))
+        for dname, Decoder in decoders:
+            def run():
+                for i in xrange(count):
+                    Decoder(pkt).executeOn(NullExecute())
+            timed('  '+dname, run, count)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    benchDecoders([
+        ('MsgDecoder_v02', packet.MsgDecoder_v02),
+        ('MsgBufferDecoder_v02', packet.MsgBufferDecoder_v02),
+        ], packet.MsgObject)
+    benchDecoders([('MsgDecoder_v03', packet_v03.MsgDecoder_v03)], packet_v03.MsgObject)
+
+if __name__=='__main__':
+    main()
+
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Encode micro-benchmarks; not collected by the unittest suites"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import time
+
+from TG.blathernet.messages import advertIdForNS, packet_v02 as packet
+from TG.blathernet.messages.msgSizer import MsgSizer
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+advertId = advertIdForNS('benchEncode')
+replyId = advertIdForNS('benchEncode/reply')
+
+def newStdMsg(body='a telemetry body', topic='topic'):
+    mobj = packet.MsgObject(advertId)
+    mobj.forward()
+    mobj.replyRef(replyId)
+    mobj.msg(body, 0, topic)
+    return mobj
+
+def timed(name, fn, count):
+    t0 = time.time()
+    fn()
+    dt = time.time() - t0
+    print '%-24s %8d msgs in %6.3fs  %10.0f msgs/s' % (name, count, dt, count/dt)
+    return dt
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def benchEncodeMany(count=20000):
+    mobjs = [newStdMsg('body %s' % (i,)) for i in xrange(count)]
+
+    def perMsg():
+        for mobj in mobjs:
+            mobj.encode()
+    def many():
+        packet.MsgObject.encodeMany(mobjs)
+
+    dtPerMsg = timed('encode per message', perMsg, count)
+    dtMany = timed('encodeMany', many, count)
+    print '%-24s %8.2fx' % ('speedup', dtPerMsg/dtMany)
+
+def sortedExecuteOn(mobj, mxRoot):
+    """Playback as executeOn did before canonical ordering at insert:
+    sort per replay, and getattr dispatch per command"""
+    mx = mxRoot.advertMsgId(mobj.advertId, mobj.msgId, mobj.src)
+    if mx:
+        cmdOrderMap = mobj._cmd_order
+        cmdList = sorted(mobj._cmdList, key=lambda (cmd, args):cmdOrderMap[cmd])
+        for fn, args in cmdList:
+            if mx.cmdPerform(fn, args) is False:
+                break
+        return mx.complete()
+
+def benchExecuteOn(count=20000):
+    mobj = newStdMsg()
+    mobj.msgId = '1234'
+
+    for name, newMx in [('MsgSizer', MsgSizer), ('MsgEncoder', packet.MsgEncoder)]:
+        def sortedReplay():
+            for i in xrange(count):
+                sortedExecuteOn(mobj, newMx())
+        def executeOn():
+            for i in xrange(count):
+                mobj.executeOn(newMx())
+
+        dtSorted = timed('sorted %s' % (name,), sortedReplay, count)
+        dtExec = timed('executeOn %s' % (name,), executeOn, count)
+        print '%-24s %8.2fx' % ('speedup', dtSorted/dtExec)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    benchEncodeMany()
+    benchExecuteOn()
+
+if __name__=='__main__':
+    main()
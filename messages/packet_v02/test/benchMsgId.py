@@ -0,0 +1,44 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""MsgId generation micro-benchmark; not collected by the unittest suites"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from TG.blathernet.messages.packet_base import iterMsgId, iterMsgIdPool
+from TG.blathernet.messages import packet_v02 as packet
+
+from .benchEncode import timed
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def benchMsgId(count=200000):
+    msgIdLen = packet.MsgEncoder.msgIdLen
+
+    def run(newMsgId):
+        for i in xrange(count):
+            newMsgId()
+
+    dtHash = timed('iterMsgId', lambda: run(iterMsgId(msgIdLen).next), count)
+    dtPool = timed('iterMsgIdPool', lambda: run(iterMsgIdPool(msgIdLen).next), count)
+    print '%-24s %8.2fx' % ('speedup', dtHash/dtPool)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    benchMsgId()
+
+if __name__=='__main__':
+    main()
+
@@ -0,0 +1,141 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+from TG.blathernet.base import PacketNS
+from TG.blathernet.messages import advertIdForNS, packet_v02 as packet
+from TG.blathernet.messages.apiMsgExecute import MsgExecuteAPI
+from TG.blathernet.messages.bodyCodec import MsgBodyRef
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgCallRecorder(MsgExecuteAPI):
+    def __init__(self):
+        self.calls = []
+
+    def advertMsgId(self, advertId, msgId=None, src=None):
+        self.calls.append(('advertMsgId', advertId, msgId))
+        return self
+    def forward(self, breadthLimit=1, whenUnhandled=True, fwdAdvertId=None):
+        self.calls.append(('forward', breadthLimit, whenUnhandled, fwdAdvertId))
+    def replyRef(self, replyAdvertIds):
+        self.calls.append(('replyRef', replyAdvertIds))
+    def adRefs(self, advertIds, key=None):
+        self.calls.append(('adRefs', advertIds, key))
+    def msg(self, body, fmt=0, topic=None):
+        self.calls.append(('msg', body, fmt, topic))
+    def end(self):
+        self.calls.append(('end',))
+        return False
+    def complete(self):
+        return self.calls
+
+class TestBufferDecode(unittest.TestCase):
+    advertId = advertIdForNS('testBufferDecode')
+    adRefList = [advertIdForNS('testBufferDecode/%s' % i) for i in xrange(16)]
+    msgId = '1357'
+
+    def assertSameCalls(self, data):
+        src = PacketNS(data)
+        r0 = packet.MsgDecoder_v02(src).executeOn(MsgCallRecorder())
+        r1 = packet.MsgBufferDecoder_v02(src).executeOn(MsgCallRecorder())
+        self.assertEqual(r0, r1)
+        for c0, c1 in zip(r0, r1):
+            self.assertEqual(map(type, c0), map(type, c1))
+        return r1
+
+    def buildEnc(self):
+        enc = packet.MsgEncoder()
+        enc.advertMsgId(self.advertId, self.msgId)
+        return enc
+
+    def testEmpty(self):
+        r = self.assertSameCalls(self.buildEnc().packet)
+        self.assertEqual(r, [('advertMsgId', self.advertId, self.msgId)])
+
+    def testForwards(self):
+        for breadth in [None, 0, 1, 3, 16, -1]:
+            for whenUnhandled in [True, False]:
+                for fwdAdvertId in [None, self.adRefList[0]]:
+                    enc = self.buildEnc()
+                    enc.forward(breadth, whenUnhandled, fwdAdvertId)
+                    self.assertSameCalls(enc.packet)
+
+    def testAdRefs(self):
+        for n in [1, 5, 16]:
+            for key in [None, 'akey', '']:
+                enc = self.buildEnc()
+                enc.adRefs(self.adRefList[:n], key)
+                self.assertSameCalls(enc.packet)
+
+    def testReplyRef(self):
+        enc = self.buildEnc()
+        enc.replyRef(self.adRefList[:3])
+        self.assertSameCalls(enc.packet)
+
+    def testMsgTopics(self):
+        for topic in [None, 0, 42, 'abcd', 'abcdefgh', self.adRefList[1], 'def', 'y'*255]:
+            for body in ['', 'a short message', 'z'*1000]:
+                enc = self.buildEnc()
+                enc.msg(body, 0x7, topic)
+                self.assertSameCalls(enc.packet)
+
+    def testStd(self):
+        enc = self.buildEnc()
+        enc.forward()
+        enc.replyRef(self.adRefList[2])
+        enc.msg('first', 1, 'topic')
+        enc.msg('second', 2, 7)
+        enc.end()
+        # trailing data after end must be ignored by both decoders
+        r = self.assertSameCalls(enc.packet + '\x80\x00\x01x')
+        self.assertEqual(r[-1], ('end',))
+
+    def testLazyBody(self):
+        enc = self.buildEnc()
+        enc.msg('first', 1, 'topic')
+        enc.msg('second', 2, 7)
+
+        class LazyRecorder(MsgCallRecorder):
+            lazyMsgBody = True
+
+        r = packet.MsgBufferDecoder_v02(PacketNS(enc.packet)).executeOn(LazyRecorder())
+        bodies = [c[1] for c in r if c[0] == 'msg']
+        self.assertEqual(map(type, bodies), [MsgBodyRef, MsgBodyRef])
+        self.assertEqual(map(len, bodies), [5, 6])
+        self.assertEqual(map(str, bodies), ['first', 'second'])
+
+    def testLazyThenPlain(self):
+        enc = self.buildEnc()
+        enc.msg('first', 1, 'topic')
+
+        class LazyRecorder(MsgCallRecorder):
+            lazyMsgBody = True
+
+        decoder = packet.MsgBufferDecoder_v02(PacketNS(enc.packet))
+        r = decoder.executeOn(LazyRecorder())
+        self.assertEqual(type(r[-1][1]), MsgBodyRef)
+
+        # a later plain executor on the same decoder gets body strs again
+        r = decoder.executeOn(MsgCallRecorder())
+        self.assertEqual(r[-1], ('msg', 'first', 1, 'topic'))
+        self.assertEqual(type(r[-1][1]), str)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
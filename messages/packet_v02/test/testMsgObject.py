@@ -16,6 +16,7 @@ import textwrap
 import StringIO
 
 from TG.blathernet.messages import advertIdForNS, packet_v02 as packet
+from TG.blathernet.messages.msgSizer import MsgSizer, MsgCmdSizes
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
@@ -81,6 +82,118 @@ class TestMsgObject(unittest.TestCase):
         mobj.autoForward()
         self.dynTestRoundtrip(mobj)
 
+    def testEncodeMany(self):
+        mobjs = []
+        for idx in xrange(10):
+            mobj = packet.MsgObject(self.advertId)
+            if idx % 2:
+                mobj.forward()
+            if idx % 3:
+                mobj.replyRef('0123456789abcdef')
+            mobj.msg('a test %s' % (idx,), idx, 'topic' if idx % 4 else None)
+            mobj.ensureMsgId()
+            mobjs.append(mobj)
+
+        packets = packet.MsgObject.encodeMany(mobjs)
+        self.assertEqual(packets, [m.encode().packet for m in mobjs])
+
+    def testEncodeManyAssign(self):
+        mobjs = [packet.MsgObject(self.advertId).msg('a test %s' % (idx,)) for idx in xrange(4)]
+        packets = packet.MsgObject.encodeMany(mobjs, True)
+        self.assertEqual(len(set(m.msgId for m in mobjs)), 4)
+        self.assertEqual(packets, [m.getFwdPacket() for m in mobjs])
+        for mobj, pkt in zip(mobjs, packets):
+            self.assertEqual(packet.MsgObject.fromData(pkt).msgId, mobj.msgId)
+
+    def testCanonicalOrder(self):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.end()
+        mobj.msg('a test')
+        mobj.forwardOnce()
+        mobj.replyRef(self.advertId)
+        mobj.msg('second')
+        mobj.forward()
+        mobj.adRefs([self.advertId])
+
+        names = [n for n, a in mobj.listCmds()]
+        self.assertEqual(names, ['replyRef', 'adRefs', 'msg', 'msg', 'forwardOnce', 'forward', 'end'])
+        self.assertEqual([a[0] for n, a in mobj.listCmds() if n == 'msg'], ['a test', 'second'])
+
+    def testSize(self):
+        mobj = packet.MsgObject(self.advertId)
+        sizes = [mobj.size]
+        mobj.forward(3, True, self.advertId)
+        mobj.replyRef(self.advertId)
+        mobj.adRefs(['0123456789abcdef'], 'key')
+        mobj.adRefs(['0123456789abcdef']*2)
+        mobj.msg('a test')
+        mobj.msg('a test', 1, 42)
+        mobj.msg('a test', 2, 'a topic')
+        mobj.replyRef('fedcba9876543210')
+        sizes.append(mobj.size)
+
+        self.assertEqual(mobj.size, mobj.calcSize())
+        self.assertEqual(len(mobj), mobj.size)
+        self.assertTrue(mobj.size >= len(mobj.encode().packet))
+
+        self.assertTrue(mobj.fitsIn(mobj.size))
+        self.assertFalse(mobj.fitsIn(mobj.size-1))
+
+        mobj.advertId = self.advertId
+        self.assertEqual(mobj.size, sizes[0])
+
+    def testSizeParity(self):
+        for topic in [None, '', 0, 42, 'abcd', 'a topic', self.advertId]:
+            for body in ['', 'a test body']:
+                mobj = packet.MsgObject(self.advertId)
+                mobj.msg(body, 2, topic)
+
+                sizer = MsgSizer()
+                sizer.msg(body, 2, topic)
+                self.assertEqual(sizer.size, MsgCmdSizes.msg(body, 2, topic), (topic, body))
+                self.assertEqual(mobj.size, mobj.calcSize())
+                self.assertTrue(mobj.size >= len(mobj.encode().packet), (topic, body))
+
+        mobj = packet.MsgObject(self.advertId)
+        mobj.msg('a test', 2, '')
+        self.assertEqual(mobj.size, len(mobj.encode().packet))
+
+    def testSealed(self):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.forward()
+        self.assertTrue(mobj.msg('a test') is mobj)
+        self.assertFalse(mobj.sealed)
+
+        pkt = mobj.getFwdPacket()
+        self.assertTrue(mobj.sealed)
+        self.assertTrue(mobj.getFwdPacket() is pkt)
+
+        # builders raise rather than silently modify a discarded clone
+        self.assertRaises(ValueError, mobj.msg, 'another test')
+        self.assertRaises(ValueError, mobj.forward)
+        self.assertRaises(ValueError, mobj.replyRef, self.advertId)
+        self.assertEqual(len(mobj.listCmds()), 2)
+        self.assertTrue(mobj.getFwdPacket() is pkt)
+
+        clone = mobj.copy().msg('another test')
+        self.assertFalse(clone.sealed)
+        self.assertEqual(clone.msgId, None)
+        self.assertEqual(len(clone.listCmds()), 3)
+        self.assertRaises(ValueError, setattr, mobj, 'advertId', self.advertId)
+
+    def testSealAutoForward(self):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.msg('a test')
+        self.assertFalse(mobj.isForwarded())
+
+        mobj.seal()
+        self.assertTrue(mobj.isForwarded())
+        pkt = mobj.getFwdPacket()
+
+        # sending a sealed message keeps its packet
+        mobj.enqueSendOn(None)
+        self.assertTrue(mobj.getFwdPacket() is pkt)
+
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Unittest Main  
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
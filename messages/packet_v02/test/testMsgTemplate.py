@@ -0,0 +1,81 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+from TG.blathernet.messages import advertIdForNS, packet_v02 as packet
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestMsgTemplate(unittest.TestCase):
+    advertId = advertIdForNS('testTemplate')
+    replyId = advertIdForNS('testTemplate/reply')
+    msgId = '1928'
+
+    def buildMsgObj(self, body, fmt=0, topic=None):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.forward()
+        mobj.replyRef(self.replyId)
+        mobj.msg(body, fmt, topic)
+        return mobj
+
+    def dynTest(self, fmt=0, topic=None):
+        tmpl = self.buildMsgObj('', fmt, topic).compileTemplate()
+        for body in ['', 'a test', 'z'*1000]:
+            mobj = self.buildMsgObj(body, fmt, topic)
+            mobj.msgId = self.msgId
+            self.assertEqual(tmpl.packet(body, self.msgId), mobj.encode().packet)
+
+            mobjT = tmpl.newMsg(body, self.msgId)
+            self.assertEqual(mobjT.msgId, self.msgId)
+            self.assertEqual(mobjT.listCmds(), mobj.listCmds())
+            self.assertEqual(mobjT.getFwdPacket(), mobj.encode().packet)
+
+            mobjDec = packet.MsgObject.fromData(tmpl.packet(body))
+            self.assertEqual(mobjDec.listCmds(), mobj.listCmds())
+
+    def testNoTopic(self):
+        self.dynTest()
+    def testTopicStr(self):
+        self.dynTest(0x3, 'topic')
+    def testTopicInt(self):
+        self.dynTest(0x5, 42)
+    def testTopicAdvertId(self):
+        self.dynTest(0xf, self.replyId)
+
+    def testAutoForward(self):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.msg('')
+        tmpl = mobj.compileTemplate()
+        self.assertTrue(tmpl.newMsg('body').isForwarded())
+        self.assertFalse(mobj.isForwarded())
+
+    def testMsgIds(self):
+        tmpl = self.buildMsgObj('').compileTemplate()
+        msgIds = set(tmpl.newMsg('body').msgId for i in xrange(100))
+        self.assertEqual(len(msgIds), 100)
+
+    def testRequiresOneMsg(self):
+        mobj = packet.MsgObject(self.advertId)
+        self.assertRaises(ValueError, mobj.compileTemplate)
+        mobj.msg('one')
+        mobj.msg('two')
+        self.assertRaises(ValueError, mobj.compileTemplate)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
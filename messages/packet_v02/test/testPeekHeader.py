@@ -0,0 +1,52 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+from TG.blathernet.messages import advertIdForNS, packet_v02 as packet
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestPeekHeader(unittest.TestCase):
+    advertId = advertIdForNS('testPeekHeader')
+    msgId = '8642'
+
+    def testPeekEncoded(self):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.forward()
+        mobj.msg('a test')
+        mobj.msgId = self.msgId
+        data = mobj.encode().packet
+
+        hdr = packet.MsgCodec().peekHeader(data)
+        self.assertEqual(hdr, ('\x02', self.msgId, self.advertId))
+
+        mobjDec = packet.MsgObject.fromData(data)
+        self.assertEqual(hdr[1:], (mobjDec.msgId, mobjDec.advertId))
+
+    def testPeekEmpty(self):
+        data = ("0231323334b64b56ec75c4c8d6ab16b894d3c0a311").decode("hex")
+        hdr = packet.MsgCodec().peekHeader(data)
+        self.assertEqual(hdr, ('\x02', '1234', advertIdForNS('testOne')))
+
+    def testPeekTruncated(self):
+        data = ("0231323334b64b56ec75c4c8d6ab16b894d3c0a3").decode("hex")
+        self.assertEqual(packet.MsgCodec().peekHeader(data), None)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""MsgCommand Packet Format, compact v03
+
+Same header and command byte layout as packet_v02, with varint encoded
+lengths and two of the v02 reserved opcodes put to use.
+
+Packet Coding:
+    [0:1]  ( 1 byte ) -> Packet Version 
+    [1:5]  ( 4 bytes) -> MsgId
+    [5:21] (16 bytes) -> AdvertId
+
+    [... commands ...]
+        [0] (1 byte) Command
+            .7:4    command key
+            .3:0    command flags
+        [k] command data
+
+    varint :: unsigned, 7 bits per byte, low groups first, high bit set on
+              all but the last byte
+
+Routing and Delivery Commands:
+    0bR000 ---- :: End boundry
+    0bR001 ffff :: Forward, as v02
+    0bR010 cccc :: Body codec, the next msg command's body is encoded with body codec cccc
+    0bR011 ---- :: XXX Unused
+
+    0bR100 nnnn :: AdvertId references, nnnn+1 references
+    0bR101 nnnn :: AdvertId references, followed by variable length key (pascal style), and nnnn+1 references
+    0bR110 nnnn :: Reply AdvertId references, and nnnn+1 references
+    0bR111 kiii :: AdvertId back-reference to entry iii of the packet's advertId table
+                    k=0: reply reference, k=1: unkeyed advertId reference
+
+    AdvertId table: the header advertId at index 0, followed by each advertId
+    of the 0bR100, 0bR101 and 0bR110 commands in packet order.  Forwarded
+    packets are relayed verbatim, so references never span packets.
+
+    * R = 0
+
+Messaging Commands:
+    Upper nibble (1mmm) => topic encoding
+    Lower nibble (ffff) => data format, receiver interpreted
+
+    Every msg command is followed by the body length as a varint, then the
+    topic (if any), then the body.
+
+    0bM000 ffff :: no topic
+    0bM001 ffff :: variable length topic, length is a varint
+    0bM010 ffff :: shared topic: repeats the topic of the previous msg with a topic
+    0bM011 ---- :: XXX Unused
+
+    0bM100 ffff :: 32-bit uint topic
+    0bM101 ffff :: 4 byte topic id
+    0bM110 ffff :: 8 byte topic id
+    0bM111 ffff :: 16 byte topic id - advertId length
+
+    * M = 1
+"""
+    
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from .msgObject import MsgObject_v03, MsgObject, MsgCodec
+from .encode import MsgEncoder_v03, MsgEncoder
+from .decode import MsgDecoder_v03, MsgDecoder
+from .template import MsgTemplate_v03, MsgTemplate
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
@@ -0,0 +1,124 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from struct import Struct
+
+from ..packet_v02.decode import CommamdDispatch
+from ..packet_v02.decodeBuffer import MsgBufferDecoder_v02
+from .varint import decodeVarint
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgDecoder_v03(MsgBufferDecoder_v02):
+    msgVersion = '\x03'
+
+    _adTable = None
+    _topic = None
+
+    # end, forward and the full advertId reference commands are as v02
+    cmds = CommamdDispatch(MsgBufferDecoder_v02.cmds)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Routing and Delivery Commands
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def _readAdvertIds(self, pkt, i, count):
+        advertIds, i = MsgBufferDecoder_v02._readAdvertIds(self, pkt, i, count)
+        self._adTable.extend(advertIds)
+        return advertIds, i
+
+    @cmds.add('0111')
+    def cmd_adBackRef(self, cmd, flags, pkt, i, mx):
+        try:
+            advertIds = [self._adTable[flags & 0x7]]
+        except IndexError:
+            raise ValueError("Invalid advertId back-reference: %r" % (flags & 0x7,))
+
+        if flags & 0x8:
+            mx.adRefs(advertIds, None)
+        else: mx.replyRef(advertIds)
+        return i
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Message and Topic Commands
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    @cmds.add('1000')
+    def cmd_msg(self, cmd, fmt, pkt, i, mx):
+        bodyLen, i = decodeVarint(pkt, i)
+        iEnd = i + bodyLen
+        mx.msg(self.newBody(pkt, i, iEnd), fmt, None)
+        return iEnd
+
+    @cmds.add('1001')
+    def cmd_msgTopicStr(self, cmd, fmt, pkt, i, mx):
+        bodyLen, i = decodeVarint(pkt, i)
+        topicLen, i = decodeVarint(pkt, i)
+        iBody = i + topicLen
+        topic = pkt[i:iBody]
+        self._topic = topic
+
+        iEnd = iBody + bodyLen
+        mx.msg(self.newBody(pkt, iBody, iEnd), fmt, topic)
+        return iEnd
+
+    @cmds.add('1010')
+    def cmd_msgSharedTopic(self, cmd, fmt, pkt, i, mx):
+        topic = self._topic
+        if topic is None:
+            raise ValueError("Shared topic msg without a preceding topic")
+
+        bodyLen, i = decodeVarint(pkt, i)
+        iEnd = i + bodyLen
+        mx.msg(self.newBody(pkt, i, iEnd), fmt, topic)
+        return iEnd
+
+    _topicStructs = {
+        # msgs with 4-byte integer as topicId
+        0xc: Struct('!I'),
+        # msg with 4-byte topic
+        0xd: Struct('4s'),
+        # msg with 8-byte topic
+        0xe: Struct('8s'),
+        # msgs with 16-byte advertId-length string as topicId
+        0xf: Struct('16s'),
+    }
+    _topicUnpackFrom = [None]*12 + [
+        (_topicStructs[ci].unpack_from, _topicStructs[ci].size)
+            for ci in xrange(12, 16)]
+
+    @cmds.add('1100', '1101', '1110', '1111')
+    def cmd_msgTopicId(self, cmd, fmt, pkt, i, mx):
+        bodyLen, i = decodeVarint(pkt, i)
+        unpack_from, size = self._topicUnpackFrom[cmd]
+        topic, = unpack_from(pkt, i)
+        i += size
+        self._topic = topic
+
+        iEnd = i + bodyLen
+        mx.msg(self.newBody(pkt, i, iEnd), fmt, topic)
+        return iEnd
+
+    cmdTable = cmds.table()
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Utility and Playback
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def executeOn(self, mxRoot):
+        self._adTable = [self.getAdvertId()]
+        self._topic = None
+        return MsgBufferDecoder_v02.executeOn(self, mxRoot)
+
+MsgDecoder = MsgDecoder_v03
@@ -0,0 +1,93 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from struct import pack
+
+from ..packet_v02.encode import MsgEncoder_v02
+from .varint import encodeVarint
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgEncoder_v03(MsgEncoder_v02):
+    msgVersion = '\x03'
+
+    _adTable = None
+    _topic = None
+
+    def advertMsgId(self, advertId, msgId=None, src=None):
+        r = MsgEncoder_v02.advertMsgId(self, advertId, msgId, src)
+        self._adTable = [self.advertId]
+        self._topic = None
+        return r
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def adRefs(self, advertIds, key=None):
+        if not advertIds: return
+        advertIds = self._verifyAdvertIds(advertIds)
+
+        if len(advertIds) == 1 and key in (None, True):
+            idx = self._findAdvertRef(advertIds[0])
+            if idx is not None:
+                # back-reference; k=0 for replyRef, k=1 for unkeyed adRefs
+                flags = idx if key is True else (0x8 | idx)
+                self._writeCmd(0x7, flags)
+                return self
+
+        r = MsgEncoder_v02.adRefs(self, advertIds, key)
+        self._adTable.extend(advertIds)
+        return r
+
+    def _findAdvertRef(self, advertId):
+        adTable = self._adTable
+        if advertId in adTable:
+            idx = adTable.index(advertId)
+            if idx < 8:
+                return idx
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Message and Topic Commands
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def msg(self, body, fmt=0, topic=None):
+        if not (0 <= fmt <= 0xf):
+            raise ValueError("Invalid format value: %r" % (fmt,))
+
+        body = self._msgBody(body)
+        lenBody = encodeVarint(len(body))
+        if not topic and topic != 0:
+            self._writeCmd(0x8, fmt, lenBody, body)
+            return self
+
+        if isinstance(topic, basestring):
+            if isinstance(topic, unicode):
+                raise ValueError("Topic cannot be unicode")
+        else: topic = int(topic)
+
+        if topic == self._topic:
+            self._writeCmd(0xa, fmt, lenBody, body)
+            return self
+        self._topic = topic
+
+        if isinstance(topic, str):
+            cmd = self._cmdByTopicLen.get(len(topic))
+            if cmd is None:
+                self._writeCmd(0x9, fmt, lenBody, encodeVarint(len(topic)), topic, body)
+            else:
+                self._writeCmd(cmd, fmt, lenBody, topic, body)
+        else:
+            self._writeCmd(0xc, fmt, lenBody, pack('!I', topic), body)
+        return self
+
+MsgEncoder = MsgEncoder_v03
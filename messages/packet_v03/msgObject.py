@@ -0,0 +1,37 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from ..msgCommand import MsgCommandObject
+from ..packet_v02.msgObject import MsgCodec_v02
+
+from .encode import MsgEncoder_v03
+from .decode import MsgDecoder_v03
+from .template import MsgTemplate_v03
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Message Object, v03
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgCodec_v03(MsgCodec_v02):
+    msgVersion = '\x03'
+    newEncoder = MsgEncoder_v03
+    newDecoder = MsgDecoder_v03
+    newTemplate = MsgTemplate_v03
+    newMsgId = MsgEncoder_v03.newMsgId
+
+class MsgObject_v03(MsgCommandObject):
+    pass
+
+MsgCodec_v03.new(MsgObject_v03)
+
+MsgCodec = MsgCodec_v03
+MsgObject = MsgObject_v03
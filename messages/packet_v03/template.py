@@ -0,0 +1,29 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from ..packet_v02.template import MsgTemplateEncoder_v02, MsgTemplate_v02
+from .encode import MsgEncoder_v03
+from .varint import encodeVarint
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgTemplateEncoder_v03(MsgTemplateEncoder_v02, MsgEncoder_v03):
+    pass
+
+class MsgTemplate_v03(MsgTemplate_v02):
+    newEncoder = MsgTemplateEncoder_v03
+    msgVersion = MsgEncoder_v03.msgVersion
+    packBodyLen = staticmethod(encodeVarint)
+
+MsgTemplate = MsgTemplate_v03
@@ -0,0 +1,125 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+from TG.blathernet.messages import advertIdForNS
+from TG.blathernet.messages.msgObject import msgCodecMap
+from TG.blathernet.messages import packet_v02, packet_v03 as packet
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestMsgObject(unittest.TestCase):
+    advertId = advertIdForNS('testRoundtrip_v03')
+    replyId = advertIdForNS('testRoundtrip_v03/reply')
+    otherId = advertIdForNS('testRoundtrip_v03/other')
+    msgId = '9876'
+
+    def dynTestRoundtrip(self, mobj):
+        mobj.msgId = self.msgId
+        mpkt = mobj.encode()
+        self.assertEqual(mpkt.packet[:1], '\x03')
+
+        newMobj = packet.MsgObject.fromData(mpkt)
+        newMpkt = newMobj.encode()
+
+        self.assertEqual(mobj.listCmds(), newMobj.listCmds())
+        self.assertEqual(mpkt.packet, newMpkt.packet)
+        return mpkt.packet
+
+    def sizeVs_v02(self, mobj):
+        pkt03 = self.dynTestRoundtrip(mobj)
+        mobj02 = packet_v02.MsgObject.fromMsgObject(mobj)
+        mobj02.msgId = self.msgId
+        pkt02 = mobj02.encode().packet
+        return len(pkt03), len(pkt02)
+
+    def testEmpty(self):
+        mobj = packet.MsgObject(self.advertId)
+        self.dynTestRoundtrip(mobj)
+
+    def testMsg(self):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.forward()
+        mobj.msg('a test')
+        mobj.msg('x'*300, 2)
+        self.dynTestRoundtrip(mobj)
+
+    def testTopics(self):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.msg('a', 1, 42)
+        mobj.msg('b', 2, 'abcd')
+        mobj.msg('c', 3, 'abcdefgh')
+        mobj.msg('d', 4, self.otherId)
+        mobj.msg('e', 5, 'a topic')
+        mobj.msg('f', 6, 'y'*300)
+        self.dynTestRoundtrip(mobj)
+
+    def testSharedTopic(self):
+        mobj = packet.MsgObject(self.advertId)
+        for i in xrange(4):
+            mobj.msg('body %s' % i, 0, 'a shared topic')
+        mobj.msg('other', 0, 7)
+        mobj.msg('again', 0, 7)
+
+        n03, n02 = self.sizeVs_v02(mobj)
+        self.assertEqual(n02 - n03, 3*(1+len('a shared topic')) + 4 + 5*1 + 1)
+
+    def testAdvertBackRefs(self):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.replyRef(self.advertId)
+        mobj.adRefs([self.otherId])
+        mobj.adRefs([self.otherId])
+        mobj.adRefs([self.advertId], 'key')
+        mobj.msg('a test')
+
+        n03, n02 = self.sizeVs_v02(mobj)
+        # replyRef and the second unkeyed adRefs become 1-byte back-references
+        self.assertEqual(n02 - n03, 2*16 + 1)
+
+    def testBadSharedTopic(self):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.msg('a test')
+        data = mobj.encode().packet
+        data = data[:21] + '\xa0' + data[22:]
+        self.assertRaises(ValueError, packet.MsgObject.fromData, data)
+
+    def testCodecMap(self):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.msgId = self.msgId
+        mobj.msg('a test')
+        data = mobj.encode().packet
+
+        codec = msgCodecMap[data[:1]]
+        self.assertEqual(codec.peekHeader(data), ('\x03', self.msgId, self.advertId))
+
+    def testTemplate(self):
+        mobj = packet.MsgObject(self.advertId)
+        mobj.replyRef(self.advertId)
+        mobj.msg('', 3, 'template topic')
+        tmpl = mobj.compileTemplate()
+
+        for body in ['', 'short', 'z'*200]:
+            newMobj = tmpl.newMsg(body, self.msgId)
+            ref = newMobj.copy()
+            ref.msgId = self.msgId
+            self.assertEqual(newMobj.fwd.packet, ref.encode().packet)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
@@ -0,0 +1,43 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+from TG.blathernet.messages.packet_v03.varint import encodeVarint, decodeVarint
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestVarint(unittest.TestCase):
+    def testEncode(self):
+        self.assertEqual(encodeVarint(0), '\x00')
+        self.assertEqual(encodeVarint(0x7f), '\x7f')
+        self.assertEqual(encodeVarint(0x80), '\x80\x01')
+        self.assertEqual(encodeVarint(300), '\xac\x02')
+        self.assertEqual(encodeVarint(0xffff), '\xff\xff\x03')
+
+    def testRoundtrip(self):
+        for value in [0, 1, 0x7f, 0x80, 0x3fff, 0x4000, 0xffff, 1<<32]:
+            data = 'ab' + encodeVarint(value) + 'yz'
+            self.assertEqual(decodeVarint(data, 2), (value, len(data)-2))
+
+    def testNegative(self):
+        self.assertRaises(ValueError, encodeVarint, -1)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
@@ -0,0 +1,50 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Unsigned LEB128 style varints: 7 bits per byte, low groups first, high
+bit set on every byte but the last."""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+_varintSmall = [chr(i) for i in xrange(0x80)]
+
+def encodeVarint(value):
+    if 0 <= value < 0x80:
+        return _varintSmall[value]
+    if value < 0:
+        raise ValueError("Varint values must not be negative: %r" % (value,))
+
+    r = []
+    while value >= 0x80:
+        r.append(chr((value & 0x7f) | 0x80))
+        value >>= 7
+    r.append(chr(value))
+    return ''.join(r)
+
+def decodeVarint(pkt, i):
+    """Returns (value, index past the varint) for the varint at pkt[i]"""
+    b = ord(pkt[i])
+    i += 1
+    if b < 0x80:
+        return b, i
+
+    value = b & 0x7f
+    shift = 7
+    while 1:
+        b = ord(pkt[i])
+        i += 1
+        value |= (b & 0x7f) << shift
+        if b < 0x80:
+            return value, i
+        shift += 7
@@ -0,0 +1,220 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import with_statement
+
+from array import array
+from weakref import ref
+
+from ..base.threadutils import Lock
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgStats(object):
+    """Message counters keyed by advertId and by receiving route.
+
+    Every count is recorded under both its advertId and its route; route
+    is the receiving route weakref, or None for locally sent messages.
+    Each key owns a row of len(fields) counters in one flat array, so a
+    count is two dict lookups and two array increments.  Increments are
+    not locked; concurrent receive threads may rarely lose a count."""
+
+    fields = ('received', 'decoded', 'duplicate', 'dispatched', 'forwarded', 'unhandled')
+    iReceived, iDecoded, iDuplicate, iDispatched, iForwarded, iUnhandled = range(len(fields))
+
+    # advertIds and routes come off the wire, so the number of rows is
+    # capped; counts past the cap are folded into the otherKey row
+    otherKey = '<other>'
+    maxAdvertRows = 4096
+    maxRouteRows = 1024
+
+    def __init__(self, maxAdvertRows=None, maxRouteRows=None):
+        if maxAdvertRows is not None:
+            self.maxAdvertRows = maxAdvertRows
+        if maxRouteRows is not None:
+            self.maxRouteRows = maxRouteRows
+        self.reset()
+
+    def reset(self):
+        self.counts = array('L')
+        self.freeRows = []
+        self.advertRows = {}
+        self.routeRows = {}
+
+    def count(self, advertId, route, field, n=1):
+        counts = self.counts
+
+        row = self.advertRows.get(advertId)
+        if row is None:
+            row = self._newRow(self.advertRows, advertId, self.maxAdvertRows)
+        counts[row + field] += n
+
+        row = self.routeRows.get(route)
+        if row is None:
+            if self._isFull(self.routeRows, self.maxRouteRows):
+                self.pruneRoutes()
+            row = self._newRow(self.routeRows, route, self.maxRouteRows)
+        counts[row + field] += n
+
+    def _isFull(self, rows, maxRows):
+        return len(rows) - (self.otherKey in rows) >= maxRows
+
+    def _newRow(self, rows, key, maxRows):
+        if self._isFull(rows, maxRows):
+            key = self.otherKey
+            row = rows.get(key)
+            if row is not None:
+                return row
+
+        counts = self.counts
+        nFields = len(self.fields)
+        if self.freeRows:
+            row = self.freeRows.pop()
+            counts[row:row+nFields] = array('L', [0]*nFields)
+        else:
+            row = len(counts)
+            counts.extend([0]*nFields)
+        rows[key] = row
+        return row
+
+    def pruneRoutes(self):
+        """Folds the counts of dead route weakrefs into the otherKey row,
+        freeing their rows.  Returns the number of routes pruned."""
+        routeRows = self.routeRows
+        dead = [r for r in routeRows if isinstance(r, ref) and r() is None]
+        if not dead:
+            return 0
+
+        counts = self.counts
+        nFields = len(self.fields)
+        for r in dead:
+            row = routeRows.pop(r)
+            other = routeRows.get(self.otherKey)
+            if other is None:
+                # the dead route's row becomes the other row
+                routeRows[self.otherKey] = row
+                continue
+
+            for i in xrange(nFields):
+                counts[other + i] += counts[row + i]
+            self.freeRows.append(row)
+        return len(dead)
+
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    def _rowDict(self, row):
+        fields = self.fields
+        return dict(zip(fields, self.counts[row:row+len(fields)]))
+
+    def getAdvert(self, advertId):
+        row = self.advertRows.get(advertId)
+        if row is None:
+            return dict.fromkeys(self.fields, 0)
+        return self._rowDict(row)
+
+    def getRoute(self, route):
+        row = self.routeRows.get(route)
+        if row is None:
+            return dict.fromkeys(self.fields, 0)
+        return self._rowDict(row)
+
+    def totals(self):
+        nFields = len(self.fields)
+        result = [0]*nFields
+        counts = self.counts
+        for row in self.advertRows.itervalues():
+            for i in xrange(nFields):
+                result[i] += counts[row + i]
+        return dict(zip(self.fields, result))
+
+    def snapshot(self):
+        """Returns a copy of all counters as dicts of field counts:
+        dict(totals=..., adverts={advertId: ...}, routes={route: ...})"""
+        rowDict = self._rowDict
+        return dict(totals=self.totals(),
+            adverts=dict((k, rowDict(row)) for k, row in self.advertRows.items()),
+            routes=dict((k, rowDict(row)) for k, row in self.routeRows.items()))
+
+    def topAdverts(self, field='forwarded', count=10):
+        """Returns [(n, advertId)] for the count adverts with the most field"""
+        i = self.fields.index(field)
+        counts = self.counts
+        top = sorted(((counts[row + i], k) for k, row in self.advertRows.items()), reverse=True)
+        return top[:count]
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class LatencyHistogram(object):
+    """Thread safe histogram of durations in seconds.
+
+    Bucket i counts durations below minLatency * 2**i, and the last bucket
+    everything slower.  The default 32 buckets from 10us reach ~6 hours."""
+
+    minLatency = 10e-6
+    nBuckets = 32
+
+    def __init__(self):
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.buckets = array('L', [0]*self.nBuckets)
+        self.count = 0
+        self.total = 0.0
+        self.maxLatency = 0.0
+
+    def add(self, dt):
+        i = 0; bound = self.minLatency
+        last = self.nBuckets - 1
+        while dt >= bound and i < last:
+            bound += bound
+            i += 1
+
+        with self.lock:
+            self.buckets[i] += 1
+            self.count += 1
+            self.total += dt
+            if dt > self.maxLatency:
+                self.maxLatency = dt
+        return i
+
+    def bucketBound(self, i):
+        """Returns the upper bound of bucket i in seconds"""
+        return self.minLatency * (1 << i)
+
+    def percentile(self, p):
+        """Returns the upper bound of the bucket holding the p (0..1)
+        percentile, or None if nothing has been recorded"""
+        with self.lock:
+            count = self.count
+            buckets = list(self.buckets)
+        if not count:
+            return None
+
+        rank = p * count
+        n = 0
+        for i, c in enumerate(buckets):
+            n += c
+            if c and n >= rank:
+                return self.bucketBound(i)
+        return self.bucketBound(len(buckets) - 1)
+
+    def snapshot(self):
+        with self.lock:
+            count = self.count
+            buckets = [(self.bucketBound(i), c) for i, c in enumerate(self.buckets) if c]
+            r = dict(count=count, max=self.maxLatency, buckets=buckets,
+                    mean=(self.total/count if count else None))
+        r.update(p50=self.percentile(0.5), p99=self.percentile(0.99))
+        return r
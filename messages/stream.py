@@ -0,0 +1,122 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from ..base import PacketNS
+from .bundle import packetLen, packetOverhead
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Stream Format
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# A packet stream is a byte stream of length framed packets, using the
+# same framing as the packets within a bundle:
+#   ([2-byte packet length][packet])*
+
+def framePacket(packet):
+    return packetLen.pack(len(packet)) + packet
+
+def packStream(packets):
+    packLen = packetLen.pack
+    parts = []
+    for packet in packets:
+        parts.append(packLen(len(packet)))
+        parts.append(packet)
+    return ''.join(parts)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class MsgStreamWriter(object):
+    """Records packets onto a file-like object as a packet stream"""
+
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, pkt):
+        packet = getattr(pkt, 'packet', pkt)
+        self.out.write(framePacket(packet))
+
+    def writeMany(self, pkts):
+        self.out.write(packStream([getattr(pkt, 'packet', pkt) for pkt in pkts]))
+
+class MsgStreamDecoder(object):
+    """Incremental decoder of a packet stream.
+
+    feed() accepts byte chunks of any size and returns a PacketNS for each
+    packet completed by that chunk; kwPkt are set on every PacketNS, for
+    example the receiving route.  Packets are sliced once out of the chunk
+    carrying them.  Only a packet split across chunks is buffered, and its
+    pieces are joined once, when the last of its bytes arrives."""
+
+    newPacketNS = PacketNS.new
+
+    def __init__(self, **kwPkt):
+        self.kwPkt = kwPkt
+        self.parts = []
+        self.nPending = 0
+        self.nNeeded = packetOverhead
+
+    def __len__(self):
+        """Number of buffered bytes not yet decoded into a packet"""
+        return self.nPending
+
+    def feed(self, data):
+        result = []
+        if self.parts:
+            self.parts.append(data)
+            self.nPending += len(data)
+            if self.nPending < self.nNeeded:
+                return result
+
+            data = ''.join(self.parts)
+            self.parts = []
+            self.nPending = 0
+
+        newPacketNS = self.newPacketNS
+        kwPkt = self.kwPkt
+        unpackLen = packetLen.unpack_from
+
+        i = 0; iEnd = len(data)
+        nNeeded = packetOverhead
+        while i + packetOverhead <= iEnd:
+            n, = unpackLen(data, i)
+            iPkt = i + packetOverhead
+            if iPkt + n > iEnd:
+                nNeeded = packetOverhead + n
+                break
+
+            i = iPkt + n
+            result.append(newPacketNS(data[iPkt:i], **kwPkt))
+
+        if i < iEnd:
+            rest = data[i:] if i else data
+            self.parts.append(rest)
+            self.nPending = len(rest)
+        self.nNeeded = nNeeded
+        return result
+
+    def close(self):
+        """Raises ValueError if the stream ended within a packet"""
+        if self.nPending:
+            raise ValueError("Truncated packet stream: %s bytes pending" % (self.nPending,))
+
+def iterStream(src, chunkSize=65536, **kwPkt):
+    """Yields a PacketNS for each packet read from file-like src"""
+    decoder = MsgStreamDecoder(**kwPkt)
+    read = src.read
+    while 1:
+        data = read(chunkSize)
+        if not data:
+            break
+        for pkt in decoder.feed(data):
+            yield pkt
+    decoder.close()
+
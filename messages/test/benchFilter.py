@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Dedupe filter micro-benchmarks; not collected by the unittest suites"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import sys
+import time
+
+from TG.blathernet.messages import advertIdForNS
+from TG.blathernet.messages.packet_base import iterMsgIdPool
+from TG.blathernet.messages.filter import MsgAdvertIdBloomFilter, MsgCuckooFilter
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+advertId = advertIdForNS('benchFilter')
+
+def timed(name, fn, count):
+    t0 = time.time()
+    fn()
+    dt = time.time() - t0
+    print '%-32s %8d lookups in %6.3fs  %10.0f lookups/s' % (name, count, dt, count/dt)
+    return dt
+
+def exactMemorySize(msgFilter):
+    seen = set()
+    def sizeof(obj):
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        return sys.getsizeof(obj)
+
+    total = 0
+    for keySet in msgFilter.keySets:
+        total += sizeof(keySet) + sum(map(sizeof, keySet))
+    return total, len(msgFilter)
+
+def cuckooMemorySize(msgFilter):
+    # last full generation plus the tip are remembered
+    remembered = msgFilter.count + msgFilter.capacity * (msgFilter.generations - 1)
+    return msgFilter.getMemorySize(), remembered
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def benchFilter(name, msgFilter, memorySize, count=100000):
+    newMsgId = iterMsgIdPool(4).next
+    msgIds = [newMsgId() for e in xrange(count)]
+
+    def insertNew():
+        for m in msgIds:
+            msgFilter(advertId, m)
+    def testRecent():
+        for m in recent:
+            msgFilter(advertId, m)
+
+    print name
+    timed('  new msgIds', insertNew, count)
+    nBytes, remembered = memorySize(msgFilter)
+
+    recent = msgIds[-2000:] * (count // 2000)
+    timed('  duplicates', testRecent, count)
+    print '  %d bytes for %d msgIds: %.1f bytes per msgId' % (nBytes, remembered, float(nBytes)/remembered)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    benchFilter('MsgAdvertIdBloomFilter', MsgAdvertIdBloomFilter(), exactMemorySize)
+    benchFilter('MsgCuckooFilter', MsgCuckooFilter(), cuckooMemorySize)
+
+if __name__=='__main__':
+    main()
+
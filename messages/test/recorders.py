@@ -0,0 +1,43 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class RecordingRoute(object):
+    """Stands in for a blather route, recording each packet sent"""
+
+    def __init__(self):
+        self.sent = []
+    def sendDispatch(self, data):
+        self.sent.append(data)
+
+class ClosedRoute(object):
+    """Stands in for a closed blather route, refusing every packet"""
+
+    def sendDispatch(self, data):
+        return False
+
+class TimerRecorder(object):
+    """Stands in for a task manager's addTimer.  Timers run only when
+    fire() is called, and are rescheduled when they return a time."""
+
+    def __init__(self):
+        self.timers = []
+    def addTimer(self, tsStart, task):
+        self.timers.append((tsStart, task))
+        return task
+    def fire(self):
+        timers = self.timers
+        self.timers = []
+        for tsStart, task in timers:
+            tsNext = task(tsStart)
+            if tsNext is not None:
+                self.addTimer(tsNext, task)
+
@@ -0,0 +1,165 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import sys
+import zlib
+import unittest
+
+from TG.blathernet import Blather
+from TG.blathernet.base import PacketNS
+from TG.blathernet.messages import advertIdForNS, packet_v02, packet_v03
+from TG.blathernet.messages.bodyCodec import EncodedBody, ZlibBodyCodec, zlibBodyCodec
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestBodyCodec(unittest.TestCase):
+    packet = packet_v02
+    advertId = advertIdForNS('testBodyCodec')
+    body = '{"cmd": ["update", {"values": [%s]}]}' % (', '.join(['"value"']*200),)
+
+    def setUp(self):
+        self.packet.MsgObject.codec.setBodyCodec(zlibBodyCodec)
+    def tearDown(self):
+        self.packet.MsgObject.codec.setBodyCodec(None)
+
+    def newMsg(self, body):
+        mobj = self.packet.MsgObject(self.advertId)
+        mobj.forward()
+        mobj.msg(body, 3, 'json')
+        mobj.msg('short', 1, 'json')
+        return mobj
+
+    def testRoundtrip(self):
+        pkt = self.newMsg(self.body).encode()
+        self.assertTrue(len(pkt.packet) < len(self.body)/4)
+
+        mobj = self.packet.MsgObject.fromData(pkt)
+        (body, fmt, topic), (short, _, _) = [args for n, args in mobj.listCmds() if n == 'msg']
+        self.assertTrue(isinstance(body, EncodedBody))
+        self.assertEqual((body.decodeBody(), fmt, topic), (self.body, 3, 'json'))
+        self.assertFalse(isinstance(short, EncodedBody))
+
+        # relaying re-encodes the compressed bytes without inflating
+        self.packet.MsgObject.codec.setBodyCodec(None)
+        self.assertEqual(mobj.encode().packet, pkt.packet)
+
+    def testBufferDecoder(self):
+        pkt = self.newMsg(self.body).encode()
+        mobj = self.packet.MsgObject()
+        self.packet.MsgDecoder(pkt).executeOn(mobj)
+        self.assertEqual(mobj.listCmds(), self.packet.MsgObject.fromData(pkt).listCmds())
+
+    def testSmallBody(self):
+        mobj = self.newMsg('x')
+        mobj.msgId = '1234'
+        pkt = mobj.encode().packet
+
+        self.packet.MsgObject.codec.setBodyCodec(None)
+        self.assertEqual(mobj.encode().packet, pkt)
+
+    def testDispatch(self):
+        rq = []
+        def fnResponder(body, fmt=0, topic=None, mctx=None):
+            rq.append((body, fmt, topic))
+
+        blather = Blather()
+        blather.addResponderFn(self.advertId, fnResponder)
+
+        pkt = self.newMsg(self.body).encode()
+        self.assertTrue(blather.msgs.queuePacket(PacketNS(pkt.packet)))
+        blather.process()
+        self.assertEqual(rq, [(self.body, 3, 'json'), ('short', 1, 'json')])
+        self.assertEqual(type(rq[0][0]), str)
+
+    def dispatchBody(self, body):
+        rq = []
+        def fnResponder(body, fmt=0, topic=None, mctx=None):
+            rq.append((body, fmt, topic))
+
+        blather = Blather()
+        blather.addResponderFn(self.advertId, fnResponder)
+
+        pkt = self.newMsg(zlibBodyCodec.EncodedBody(body)).encode()
+        errors = []
+        excepthook = sys.excepthook
+        sys.excepthook = lambda *exc: errors.append(exc[0])
+        try:
+            self.assertTrue(blather.msgs.queuePacket(PacketNS(pkt.packet)))
+            blather.process()
+        finally:
+            sys.excepthook = excepthook
+
+        # the bad msg is logged and dropped; the rest of the packet dispatches
+        self.assertEqual(errors, [ValueError])
+        self.assertEqual(rq, [('short', 1, 'json')])
+
+    def testDispatchCorruptBody(self):
+        self.dispatchBody('not a zlib stream at all')
+
+    def testDispatchOversizeBody(self):
+        self.dispatchBody(zlib.compress('x'*(zlibBodyCodec.maxBodySize+1)))
+
+    def testMaxBodySize(self):
+        codec = ZlibBodyCodec(maxBodySize=1000)
+        self.assertEqual(codec.decodeBody(zlib.compress('x'*1000)), 'x'*1000)
+        self.assertRaises(ValueError, codec.decodeBody, zlib.compress('x'*1001))
+        self.assertRaises(ValueError, codec.decodeBody, 'corrupt')
+
+    def testEncodedBodySize(self):
+        body = zlibBodyCodec.encodeBody(self.body)
+        mobj = self.packet.MsgObject(self.advertId)
+        mobj.msg(body, 3)
+        plain = self.packet.MsgObject(self.advertId)
+        plain.msg(str(body), 3)
+
+        # one more byte for the body codec command
+        self.assertEqual(mobj.size, plain.size + 1)
+        self.packet.MsgObject.codec.setBodyCodec(None)
+        self.assertEqual(len(mobj.encode().packet), len(plain.encode().packet) + 1)
+        self.assertTrue(mobj.size >= len(mobj.encode().packet))
+
+    def testTemplate(self):
+        mobj = self.packet.MsgObject(self.advertId)
+        mobj.msg('', 3, 'json')
+        tmpl = mobj.compileTemplate()
+        self.assertTrue(tmpl.bodyCodec is zlibBodyCodec)
+
+        for body in [self.body, 'short']:
+            pkt = tmpl.packet(body, '1234')
+            ref = tmpl.newMsg(body, '1234').copy().encode().packet
+            self.assertEqual(pkt, ref)
+
+            rt = self.packet.MsgObject.fromData(pkt)
+            (rtBody, fmt, topic), = [args for n, args in rt.listCmds() if n == 'msg']
+            self.assertEqual((str(rtBody.decodeBody() if isinstance(rtBody, EncodedBody) else rtBody), fmt, topic), (body, 3, 'json'))
+        self.assertTrue(len(tmpl.packet(self.body)) < len(self.body)/4)
+
+        # EncodedBody bodies keep their codec without a template codec
+        self.packet.MsgObject.codec.setBodyCodec(None)
+        tmpl = mobj.compileTemplate()
+        self.assertEqual(tmpl.bodyCodec, None)
+        pkt = tmpl.packet(zlibBodyCodec.encodeBody(self.body))
+        rt = self.packet.MsgObject.fromData(pkt)
+        self.assertEqual(rt.listCmds()[0][1][0].decodeBody(), self.body)
+
+class TestBodyCodec_v03(TestBodyCodec):
+    packet = packet_v03
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
@@ -0,0 +1,152 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import weakref
+import unittest
+
+from TG.blathernet import Blather
+from TG.blathernet.base import PacketNS
+from TG.blathernet.messages import advertIdForNS, packet_v02 as packet
+from TG.blathernet.messages.bundle import packBundle, iterBundle, splitBundle, msgBundleVersion, MsgPacketBatcher
+from TG.blathernet.messages.test.recorders import RecordingRoute, ClosedRoute, TimerRecorder
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestBundle(unittest.TestCase):
+    advertId = advertIdForNS('testBundle')
+
+    def newPackets(self, count, size=40):
+        return [packet.MsgObject(self.advertId).msg(('%s' % i)*size).encode().packet
+                for i in xrange(count)]
+
+    def testRoundtrip(self):
+        packets = self.newPackets(5)
+        self.assertEqual(list(iterBundle(packBundle(packets))), packets)
+
+    def testTruncated(self):
+        bundle = packBundle(self.newPackets(2))
+        self.assertRaises(ValueError, list, iterBundle(bundle[:-1]))
+
+    def testMalformedLengths(self):
+        packets = self.newPackets(2)
+        bundle = packBundle(packets)
+        for bad in ['\x0f\x00', '\x0f\x000abc', bundle + '\x00', bundle + '\x00\x10abc']:
+            self.assertRaises(ValueError, splitBundle, bad)
+
+    def testRecvMalformed(self):
+        rq = []
+        def fnResponder(body, fmt=0, topic=None, mctx=None):
+            rq.append(body)
+
+        blather = Blather()
+        blather.addResponderFn(self.advertId, fnResponder)
+
+        packets = self.newPackets(2)
+        bundle = packBundle(packets)
+        for bad in ['\x0f\x00', '\x0f\x000abc', bundle + '\x00', bundle + '\x00\x10abc']:
+            self.assertFalse(blather.msgs.queuePacket(PacketNS(bad)))
+        blather.process()
+        self.assertEqual(rq, [])
+
+    def testBatchMTU(self):
+        route = RecordingRoute(); wrRoute = weakref.ref(route)
+        tasks = TimerRecorder()
+        batcher = MsgPacketBatcher(tasks, mtu=300, flushDelay=0.01)
+
+        packets = self.newPackets(12)
+        for pkt in packets:
+            batcher.sendDispatch(wrRoute, pkt)
+
+        # one flush timer for the route, bundles sent as the mtu fills
+        self.assertEqual([ts for ts, t in tasks.timers], [0.01])
+        tasks.fire()
+        self.assertEqual(len(batcher), 0)
+
+        self.assertTrue(1 < len(route.sent) < len(packets))
+        self.assertTrue(max(map(len, route.sent)) <= 300)
+
+        recv = []
+        for data in route.sent:
+            if data[:1] == msgBundleVersion:
+                recv.extend(iterBundle(data))
+            else: recv.append(data)
+        self.assertEqual(recv, packets)
+
+    def testBatchSingle(self):
+        route = RecordingRoute(); wrRoute = weakref.ref(route)
+        batcher = MsgPacketBatcher(TimerRecorder())
+
+        pkt, = self.newPackets(1)
+        batcher.sendDispatch(wrRoute, pkt)
+        self.assertEqual(route.sent, [])
+        self.assertEqual(batcher.flush(), 1)
+        self.assertEqual(route.sent, [pkt])
+
+    def testBatchOversize(self):
+        route = RecordingRoute(); wrRoute = weakref.ref(route)
+        batcher = MsgPacketBatcher(TimerRecorder(), mtu=100)
+
+        pkt, = self.newPackets(1, 200)
+        batcher.sendDispatch(wrRoute, pkt)
+        self.assertEqual(route.sent, [pkt])
+
+    def testBatchRefused(self):
+        batcher = MsgPacketBatcher(TimerRecorder(), mtu=100)
+        small, = self.newPackets(1, 10)
+        big, = self.newPackets(1, 200)
+
+        route = RecordingRoute(); wrRoute = weakref.ref(route)
+        self.assertTrue(batcher.sendDispatch(wrRoute, small))
+        self.assertTrue(batcher.sendDispatch(wrRoute, big))
+
+        closed = ClosedRoute(); wrClosed = weakref.ref(closed)
+        self.assertFalse(batcher.sendDispatch(wrClosed, big))
+
+        del route, closed
+        self.assertFalse(batcher.sendDispatch(wrRoute, small))
+        self.assertEqual(len(batcher), 0)
+
+    def testBatchOversizeOrder(self):
+        route = RecordingRoute(); wrRoute = weakref.ref(route)
+        batcher = MsgPacketBatcher(TimerRecorder(), mtu=100)
+
+        small, = self.newPackets(1, 10)
+        big, = self.newPackets(1, 200)
+        batcher.sendDispatch(wrRoute, small)
+        batcher.sendDispatch(wrRoute, big)
+        self.assertEqual(route.sent, [small, big])
+        self.assertEqual(len(batcher), 0)
+
+    def testRecvDemux(self):
+        rq = []
+        def fnResponder(body, fmt=0, topic=None, mctx=None):
+            rq.append(body)
+
+        blather = Blather()
+        blather.addResponderFn(self.advertId, fnResponder)
+
+        packets = self.newPackets(3)
+        bundle = packBundle(packets + packets[:1])
+        self.assertTrue(blather.msgs.queuePacket(PacketNS(bundle)))
+        blather.process()
+
+        self.assertEqual(sorted(rq), ['0'*40, '1'*40, '2'*40])
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
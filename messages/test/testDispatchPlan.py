@@ -0,0 +1,84 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+from TG.blathernet import Blather
+from TG.blathernet.adverts.entry import AdvertEntry
+from TG.blathernet.adverts.responder import IAdvertResponder, FunctionAdvertResponder
+from TG.blathernet.messages import advertIdForNS
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class RecordingResponder(IAdvertResponder):
+    def __init__(self):
+        self.calls = []
+    def beginResponse(self, mctx, mrules):
+        self.calls.append('begin')
+    def msg(self, body, fmt, topic, mctx):
+        self.calls.append(body)
+    def finishResponse(self, mctx):
+        self.calls.append('finish')
+
+class TestDispatchPlan(unittest.TestCase):
+    advertId = advertIdForNS('testDispatchPlan')
+
+    def testPlan(self):
+        entry = AdvertEntry(self.advertId)
+        self.assertEqual(entry.getDispatchPlan().responders, ())
+
+        fnr = FunctionAdvertResponder(lambda *args: None)
+        entry.addResponder(fnr)
+        plan = entry.getDispatchPlan()
+        self.assertTrue(entry.getDispatchPlan() is plan)
+        self.assertEqual(plan.responders, (fnr,))
+        self.assertEqual(plan.beginResponders, ())
+        self.assertEqual(plan.finishResponders, ())
+        self.assertEqual(plan.prohibitResponders, ())
+
+        rr = RecordingResponder()
+        entry.addResponder(rr)
+        plan = entry.getDispatchPlan()
+        self.assertEqual(plan.responders, (fnr, rr))
+        self.assertEqual(plan.beginResponders, (rr,))
+        self.assertEqual(plan.finishResponders, (rr,))
+        self.assertEqual(plan.prohibitResponders, ())
+
+        self.assertTrue(entry.removeResponder(fnr))
+        self.assertFalse(entry.removeResponder(fnr))
+        self.assertEqual(entry.getDispatchPlan().responders, (rr,))
+
+    def testDispatch(self):
+        fnCalls = []
+        def fnResponder(body, fmt=0, topic=None, mctx=None):
+            fnCalls.append(body)
+
+        blather = Blather()
+        rr = RecordingResponder()
+        blather.addResponderFn(self.advertId, fnResponder)
+        blather.addResponder(self.advertId, rr)
+
+        blather.newMsg(self.advertId).msg('body').send()
+        blather.process()
+
+        self.assertEqual(fnCalls, ['body'])
+        self.assertEqual(rr.calls, ['begin', 'body', 'finish'])
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
@@ -0,0 +1,100 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+import threading
+from itertools import count
+
+from TG.blathernet import Blather
+from TG.blathernet.messages import advertIdForNS
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestDispatchQueue(unittest.TestCase):
+    advertId = advertIdForNS('testDispatchQueue')
+
+    def setUp(self):
+        self.rq = []
+        def fnResponder(body, fmt=0, topic=None, mctx=None):
+            self.rq.append(body)
+
+        self.blather = Blather()
+        self.blather.addResponderFn(self.advertId, fnResponder)
+
+    def sendMsgs(self, n):
+        bodies = ['msg %s' % (i,) for i in xrange(n)]
+        for body in bodies:
+            self.blather.newMsg(self.advertId).msg(body).send()
+        return bodies
+
+    def testBatchSize(self):
+        msgs = self.blather.msgs
+        msgs.setDispatchBatch(3)
+        bodies = self.sendMsgs(10)
+        self.assertEqual(len(self.blather.tasks), 1)
+
+        self.blather.tasks.processTasks()
+        self.assertEqual(self.rq, bodies[:3])
+        self.assertEqual(len(self.blather.tasks), 1)
+
+        self.blather.process()
+        self.assertEqual(self.rq, bodies)
+        self.assertEqual(len(self.blather.tasks), 0)
+        self.assertFalse(msgs._drainScheduled)
+
+    def testTimeBudget(self):
+        msgs = self.blather.msgs
+        msgs.setDispatchBatch(100, 1.5)
+        msgs.timestamp = count().next
+        bodies = self.sendMsgs(5)
+
+        self.blather.tasks.processTasks()
+        self.assertEqual(self.rq, bodies[:2])
+        self.blather.process()
+        self.assertEqual(self.rq, bodies)
+
+    def testRequeue(self):
+        bodies = self.sendMsgs(2)
+        self.blather.process()
+        bodies += self.sendMsgs(2)
+        self.assertEqual(len(self.blather.tasks), 1)
+        self.blather.process()
+        self.assertEqual(self.rq, bodies)
+
+    def testConcurrentQueue(self):
+        msgs = self.blather.msgs
+        mobjs = [self.blather.newMsg(self.advertId).msg('msg %s' % (i,)) for i in xrange(400)]
+        for mobj in mobjs:
+            mobj.enqueSendOn(msgs)
+
+        def queueSome(part):
+            for mobj in part:
+                msgs._queueDispatch(mobj)
+        threads = [threading.Thread(target=queueSome, args=(mobjs[i::4],)) for i in xrange(4)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+
+        # however the receive threads interleave, one drain task is queued
+        self.assertEqual(len(self.blather.tasks), 1)
+        self.blather.process()
+        self.assertEqual(sorted(self.rq), sorted('msg %s' % (i,) for i in xrange(400)))
+        self.assertFalse(msgs._drainScheduled)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
@@ -0,0 +1,88 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+from TG.blathernet import Blather
+from TG.blathernet.base import PacketNS
+from TG.blathernet.messages import advertIdForNS, packet_v02, packet_v03
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestEarlyDrop(unittest.TestCase):
+    packet = packet_v02
+    advertId = advertIdForNS('testEarlyDrop')
+    unknownAdvertId = advertIdForNS('testEarlyDrop/unknown')
+
+    def setUp(self):
+        self.rq = []
+        def fnResponder(body, fmt=0, topic=None, mctx=None):
+            self.rq.append(body)
+
+        self.blather = Blather()
+        self.blather.addResponderFn(self.advertId, fnResponder)
+
+        msgs = self.blather.msgs
+        self.queued = []
+        def queueDispatch(mobj, _queueDispatch=msgs._queueDispatch):
+            self.queued.append(mobj)
+            return _queueDispatch(mobj)
+        msgs._queueDispatch = queueDispatch
+
+    def newPkt(self, advertId, body='body'):
+        data = self.packet.MsgObject(advertId).msg(body).encode().packet
+        return PacketNS(data, recvRoute='routeA')
+
+    def testDuplicate(self):
+        msgs = self.blather.msgs
+        pkt = self.newPkt(self.advertId)
+        self.assertTrue(msgs.queuePacket(pkt))
+        self.assertFalse(msgs.queuePacket(pkt.copy()))
+        self.blather.process()
+
+        self.assertEqual(self.rq, ['body'])
+        self.assertEqual(len(self.queued), 1)
+        stats = msgs.stats.getAdvert(self.advertId)
+        self.assertEqual((stats['received'], stats['duplicate'], stats['decoded'], stats['dispatched']), (2, 1, 1, 1))
+
+    def testDropUnknownAdverts(self):
+        msgs = self.blather.msgs
+        msgs.dropUnknownAdverts = True
+        self.assertFalse(msgs.queuePacket(self.newPkt(self.unknownAdvertId)))
+        self.assertTrue(msgs.queuePacket(self.newPkt(self.advertId)))
+        self.blather.process()
+
+        self.assertEqual(self.rq, ['body'])
+        self.assertEqual(len(self.queued), 1)
+        stats = msgs.stats.getAdvert(self.unknownAdvertId)
+        self.assertEqual((stats['received'], stats['decoded'], stats['dispatched'], stats['unhandled']), (1, 0, 0, 1))
+
+    def testKeepUnknownAdverts(self):
+        msgs = self.blather.msgs
+        self.assertTrue(msgs.queuePacket(self.newPkt(self.unknownAdvertId)))
+        self.blather.process()
+
+        self.assertEqual(len(self.queued), 1)
+        self.assertEqual(msgs.stats.getAdvert(self.unknownAdvertId)['decoded'], 1)
+
+class TestEarlyDrop_v03(TestEarlyDrop):
+    packet = packet_v03
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
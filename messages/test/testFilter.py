@@ -0,0 +1,255 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import weakref
+import unittest
+from threading import Thread
+
+from TG.blathernet import Blather
+from TG.blathernet.messages import advertIdForNS
+from TG.blathernet.messages.packet_base import iterMsgIdPool
+from TG.blathernet.messages.filter import MsgAdvertIdBloomFilter, MsgCuckooFilter, MsgShardedFilter
+from TG.blathernet.messages.test.recorders import TimerRecorder
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestDefaultFilter(unittest.TestCase):
+    def testExact(self):
+        # probabilistic filters drop legitimate messages, so are opt-in
+        self.assertTrue(isinstance(Blather().msgs.msgFilter, MsgAdvertIdBloomFilter))
+
+class TestMsgFilter(unittest.TestCase):
+    advertId = advertIdForNS('testFilter')
+
+    def newFilter(self):
+        return MsgAdvertIdBloomFilter()
+
+    def newMsgIds(self, count):
+        newMsgId = iterMsgIdPool(4).next
+        return [newMsgId() for e in xrange(count)]
+
+    def testDuplicates(self):
+        msgFilter = self.newFilter()
+        msgIds = self.newMsgIds(500)
+        self.assertEqual([msgFilter(self.advertId, m) for m in msgIds], [False]*500)
+        self.assertEqual([msgFilter(self.advertId, m) for m in msgIds], [True]*500)
+        self.assertFalse(msgFilter(self.advertId, None))
+        self.assertFalse(msgFilter(self.advertId, None))
+
+    def testTestOnly(self):
+        msgFilter = self.newFilter()
+        msgId, = self.newMsgIds(1)
+        self.assertFalse(msgFilter.test(self.advertId, msgId))
+        self.assertFalse(msgFilter.test(self.advertId, msgId))
+        self.assertFalse(msgFilter(self.advertId, msgId))
+        self.assertTrue(msgFilter.test(self.advertId, msgId))
+
+    def testPerAdvert(self):
+        msgFilter = self.newFilter()
+        otherAdvertId = advertIdForNS('testFilter/other')
+        msgId, = self.newMsgIds(1)
+        self.assertFalse(msgFilter(self.advertId, msgId))
+        self.assertFalse(msgFilter(otherAdvertId, msgId))
+        self.assertTrue(msgFilter(self.advertId, msgId))
+        self.assertTrue(msgFilter(otherAdvertId, msgId))
+
+    def testFilterKey(self):
+        msgFilter = self.newFilter()
+        key = msgFilter.filterKey(self.advertId, '1357')
+        self.assertTrue(isinstance(key, (int, long)))
+        self.assertEqual(key >> 32, 0x31333537)
+        self.assertEqual(msgFilter.filterKey(self.advertId, '12345678'), '12345678'+self.advertId[:4])
+
+    def testCounters(self):
+        msgFilter = self.newFilter()
+        msgIds = self.newMsgIds(50)
+        for m in msgIds + msgIds[:20]:
+            msgFilter(self.advertId, m)
+        stats = msgFilter.stats()
+        self.assertEqual(stats['caught'], 20)
+        self.assertEqual(stats['passed'], 50)
+        self.assertEqual(stats['evicted'], 0)
+        self.assertEqual(stats['remembered'], 50)
+
+    def testTimerRotation(self):
+        tasks = TimerRecorder()
+        msgFilter = self.newFilter()
+        msgFilter.startRotation(tasks)
+        self.assertEqual(len(tasks.timers), 1)
+
+        m0, = self.newMsgIds(1)
+        msgFilter(self.advertId, m0)
+        for e in xrange(self.generations(msgFilter) - 1):
+            tasks.fire()
+            self.assertTrue(msgFilter.test(self.advertId, m0))
+        tasks.fire()
+        self.assertFalse(msgFilter.test(self.advertId, m0))
+
+        msgFilter.stopRotation()
+        tasks.fire()
+        self.assertEqual(tasks.timers, [])
+
+    def generations(self, msgFilter):
+        return msgFilter.depth
+
+    def testMemoryCap(self):
+        msgFilter = MsgAdvertIdBloomFilter(depth=4, maxEntries=1000)
+        msgFilter._checkPeriod = False
+        for m in self.newMsgIds(2500):
+            msgFilter(self.advertId, m)
+        self.assertTrue(len(msgFilter) <= 1000)
+        self.assertEqual(msgFilter.nEvicted + len(msgFilter), 2500)
+
+    def testTimerWeakRef(self):
+        tasks = TimerRecorder()
+        msgFilter = self.newFilter()
+        msgFilter.startRotation(tasks)
+        tasks.fire()
+        self.assertEqual(len(tasks.timers), 1)
+
+        # the rotation timer does not keep the filter alive
+        wrFilter = weakref.ref(msgFilter)
+        del msgFilter
+        self.assertEqual(wrFilter(), None)
+        tasks.fire()
+        self.assertEqual(tasks.timers, [])
+
+class TestMsgAdvertIdBloomFilter(unittest.TestCase):
+    advertId = advertIdForNS('testFilter')
+
+    def testEvictOldest(self):
+        msgFilter = MsgAdvertIdBloomFilter(depth=4, maxEntries=1000)
+        msgFilter._checkPeriod = False
+        newMsgId = iterMsgIdPool(4).next
+        gens = [[newMsgId() for e in xrange(300)] for g in xrange(4)]
+
+        for msgIds in gens[:3]:
+            for m in msgIds:
+                msgFilter(self.advertId, m)
+            msgFilter.rotate()
+
+        tsTip = msgFilter.tsTip
+        for m in gens[3][:200]:
+            msgFilter(self.advertId, m)
+
+        # only the oldest generation is forgotten, and the tip is kept
+        self.assertEqual(msgFilter.nEvicted, 300)
+        self.assertEqual(len(msgFilter), 800)
+        self.assertEqual(msgFilter.tsTip, tsTip)
+        self.assertEqual(len(msgFilter.keySets[0]), 200)
+        self.assertFalse(msgFilter.test(self.advertId, gens[0][0]))
+        self.assertTrue(msgFilter.test(self.advertId, gens[1][0]))
+
+class TestMsgCuckooFilter(TestMsgFilter):
+    def generations(self, msgFilter):
+        return msgFilter.generations
+
+
+    def newFilter(self, **kw):
+        return MsgCuckooFilter(**kw)
+
+    def testSizing(self):
+        msgFilter = self.newFilter(capacity=1000, fpRate=1e-3)
+        self.assertTrue(msgFilter.capacity >= 1000)
+        self.assertEqual(msgFilter.typecode, 'H')
+        self.assertEqual(msgFilter.getMemorySize(),
+                msgFilter.generations * (1 << msgFilter.nBits) * msgFilter.bucketSize * 2)
+        self.assertRaises(ValueError, self.newFilter, fpRate=1e-12)
+
+    def testMemoryCap(self):
+        msgFilter = self.newFilter(capacity=1000, generations=2)
+        msgFilter._checkPeriod = False
+        for m in self.newMsgIds(3*msgFilter.capacity):
+            msgFilter(self.advertId, m)
+        self.assertEqual(msgFilter.nEvicted, msgFilter.capacity)
+
+    def testCapacityRotation(self):
+        msgFilter = self.newFilter(capacity=1000, generations=2)
+        memSize = msgFilter.getMemorySize()
+        capacity = msgFilter.capacity
+
+        msgIds = self.newMsgIds(3*capacity)
+        for m in msgIds:
+            msgFilter(self.advertId, m)
+        self.assertEqual(msgFilter.getMemorySize(), memSize)
+
+        # the last full generation and the tip are remembered
+        recent = msgIds[-capacity:]
+        self.assertEqual(sum(msgFilter.test(self.advertId, m) for m in recent), len(recent))
+        oldest = msgIds[:capacity]
+        self.assertTrue(sum(msgFilter.test(self.advertId, m) for m in oldest) < 10)
+
+    def testPeriodRotation(self):
+        ts = [0.0]
+        msgFilter = self.newFilter(period=10.0)
+        msgFilter.timer = lambda: ts[0]
+        msgFilter.rotate()
+
+        m0, m1, m2 = self.newMsgIds(3)
+        msgFilter(self.advertId, m0)
+        ts[0] = 11.0
+        msgFilter(self.advertId, m1)
+        self.assertTrue(msgFilter.test(self.advertId, m0))
+        ts[0] = 22.0
+        msgFilter(self.advertId, m2)
+        self.assertFalse(msgFilter.test(self.advertId, m0))
+        self.assertTrue(msgFilter.test(self.advertId, m1))
+
+    def testFalsePositives(self):
+        msgFilter = self.newFilter(capacity=20000, fpRate=1e-3)
+        for m in self.newMsgIds(msgFilter.capacity):
+            msgFilter(self.advertId, m)
+        fp = sum(msgFilter.test(self.advertId, m) for m in self.newMsgIds(20000))
+        self.assertTrue(fp < 20000 * 1e-3 * 4, fp)
+
+class TestMsgShardedFilter(TestMsgFilter):
+    def newFilter(self, **kw):
+        return MsgShardedFilter(4, MsgAdvertIdBloomFilter, **kw)
+
+    def generations(self, msgFilter):
+        return msgFilter.shards[0][1].depth
+
+    def testMemoryCap(self):
+        msgFilter = self.newFilter(depth=4, maxEntries=250)
+        for lock, shard in msgFilter.shards:
+            shard._checkPeriod = False
+        for m in self.newMsgIds(2500):
+            msgFilter(self.advertId, m)
+        self.assertTrue(len(msgFilter) <= 1000)
+        self.assertEqual(msgFilter.nEvicted + len(msgFilter), 2500)
+
+    def testThreaded(self):
+        msgFilter = self.newFilter()
+        msgIds = self.newMsgIds(2000)
+
+        def receive():
+            for m in msgIds:
+                msgFilter(self.advertId, m)
+
+        threads = [Thread(target=receive) for e in xrange(4)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+
+        # each msgId passes exactly once, whichever thread saw it first
+        self.assertEqual(msgFilter.nPassed, len(msgIds))
+        self.assertEqual(msgFilter.nCaught, 3*len(msgIds))
+        self.assertEqual(len(msgFilter), len(msgIds))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
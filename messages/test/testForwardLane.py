@@ -0,0 +1,90 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import with_statement
+import weakref
+import unittest
+
+from TG.blathernet import Blather
+from TG.blathernet.base import PacketNS
+from TG.blathernet.messages import advertIdForNS
+from TG.blathernet.messages.test.recorders import RecordingRoute, ClosedRoute
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestForwardLane(unittest.TestCase):
+    advertId = advertIdForNS('testForwardLane')
+
+    def setUp(self):
+        self.blather = Blather()
+        self.route = RecordingRoute()
+        self.blather.advertDb.addRoutes(self.advertId, [self.route])
+
+        # a relay lane saturated by a forward storm sheds each new task
+        tasks = self.blather.tasks
+        self.relay = tasks.lanes[tasks.laneRelay]
+        self.relay.maxDepth = 0
+
+    def testLocalSendSkipsRelayLane(self):
+        with self.blather.sendTo(self.advertId) as mobj:
+            mobj.msg('local').forward()
+
+        self.blather.process()
+        self.assertEqual(len(self.route.sent), 1)
+        self.assertEqual(self.relay.nShed, 0)
+
+    def testReceivedRelayed(self):
+        mobj = self.blather.newMsg(self.advertId).msg('remote').forward()
+        packet = mobj.encode().packet
+
+        recvRoute = RecordingRoute()
+        pkt = PacketNS.new(packet)
+        pkt.recvRoute = weakref.ref(recvRoute)
+        self.blather.msgs.queuePacket(pkt)
+
+        self.blather.process()
+        self.assertEqual(self.route.sent, [])
+        self.assertEqual(self.relay.nShed, 1)
+
+class TestForwardCount(unittest.TestCase):
+    advertId = advertIdForNS('testForwardCount')
+
+    def forwardCount(self, batching, *routes):
+        blather = Blather()
+        blather.msgs.setPacketBatching(batching)
+        route = RecordingRoute()
+        blather.advertDb.addRoutes(self.advertId, [route] + list(routes))
+
+        with blather.sendTo(self.advertId) as mobj:
+            mobj.msg('counted').forward(0)
+        blather.process()
+        blather.msgs.batcher and blather.msgs.batcher.flush()
+
+        self.assertEqual(len(route.sent), 1)
+        return blather.msgs.stats.getAdvert(self.advertId)['forwarded']
+
+    def testDirect(self):
+        closedRoute = ClosedRoute()
+        self.assertEqual(self.forwardCount(False, closedRoute), 1)
+
+    def testBatched(self):
+        self.assertEqual(self.forwardCount(True), 1)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
@@ -0,0 +1,144 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+
+from TG.blathernet import Blather
+from TG.blathernet.messages import advertIdForNS, MsgObject
+from TG.blathernet.messages.msgCompact import MsgCompactObject, MsgCompactPool
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestMsgCompact(unittest.TestCase):
+    advertId = advertIdForNS('testMsgCompact')
+    replyId = advertIdForNS('testMsgCompact/reply')
+
+    def build(self, mobj):
+        mobj.msg('a test', 2, 'topic')
+        mobj.forward()
+        mobj.replyRef(self.replyId)
+        mobj.adRefs([self.advertId], 'key')
+        mobj.msgId = '1234'
+        return mobj
+
+    def testSlots(self):
+        mobj = MsgCompactObject(self.advertId)
+        self.assertFalse(hasattr(mobj, '__dict__'))
+
+    def testEncodeMatches(self):
+        mobj = self.build(MsgCompactObject(self.advertId))
+        ref = self.build(MsgObject(self.advertId))
+
+        self.assertEqual(mobj.listCmds(), ref.listCmds())
+        self.assertEqual(mobj.size, ref.size)
+        self.assertEqual(mobj.replyId, self.replyId)
+        self.assertEqual(mobj.getFwdPacket(), ref.encode().packet)
+
+        rt = MsgObject.fromData(mobj.getFwdPacket())
+        self.assertEqual(rt.listCmds(), ref.listCmds())
+
+    def testPool(self):
+        pool = MsgCompactPool(maxFree=1)
+        a = pool.newMsg(self.advertId, self.replyId)
+        b = pool.newMsg(self.advertId)
+        self.assertTrue(pool.release(a))
+        self.assertFalse(pool.release(a))
+        self.assertFalse(pool.release(b))
+        self.assertEqual(len(pool), 1)
+
+        c = pool.newMsg(self.replyId)
+        self.assertTrue(c is a)
+        self.assertEqual((c.advertId, c.cmds, c.msgId), (self.replyId, (), None))
+
+    def testSendRecycles(self):
+        blather = Blather()
+        pool = blather.msgs.compactPool
+
+        mobj = blather.msgs.newCompactMsg(self.advertId)
+        mobj.msg('a test', 2, 'topic')
+        mobj.send()
+        blather.process()
+
+        self.assertEqual(len(pool), 1)
+        self.assertTrue(blather.msgs.newCompactMsg(self.advertId) is mobj)
+
+    def testResponderKeepsMsg(self):
+        rq = []
+        def fnResponder(body, fmt=0, topic=None, mctx=None):
+            rq.append(mctx.src.mobj)
+
+        blather = Blather()
+        blather.addResponderFn(self.advertId, fnResponder)
+        pool = blather.msgs.compactPool
+
+        mobj = blather.msgs.newCompactMsg(self.advertId)
+        mobj.msg('a test', 2, 'topic')
+        mobj.send()
+        blather.process()
+
+        # exposed to a responder, so not recycled out from under it
+        self.assertEqual(len(pool), 0)
+        self.assertTrue(rq[0] is mobj)
+        self.assertEqual(mobj.listCmds()[0], ('msg', ('a test', 2, 'topic')))
+        self.assertFalse(blather.msgs.newCompactMsg(self.advertId) is mobj)
+
+    def testSendUnbound(self):
+        mobj = MsgCompactObject(self.advertId)
+        mobj.msg('a test')
+        self.assertRaises(ValueError, mobj.send)
+        self.assertRaises(ValueError, MsgCompactPool().newMsg(self.advertId).send)
+
+    def testTemplateCopySend(self):
+        rq = []
+        def fnResponder(body, fmt=0, topic=None, mctx=None):
+            rq.append(body)
+
+        blather = Blather()
+        blather.addResponderFn(self.advertId, fnResponder)
+
+        tmpl = blather.msgs.newCompactMsg(self.advertId)
+        with tmpl as mobj:
+            self.assertTrue(mobj.pool is tmpl.pool)
+            mobj.msg('from a copy')
+            mobj.send()
+        blather.process()
+        self.assertEqual(rq, ['from a copy'])
+
+    def testPooledResponderKeepsMsg(self):
+        rq = []
+        def fnResponder(body, fmt=0, topic=None, mctx=None):
+            rq.append(mctx.src.mobj)
+
+        blather = Blather()
+        blather.addResponderFn(self.advertId, fnResponder, pooled=True)
+        pool = blather.msgs.compactPool
+
+        mobj = blather.msgs.newCompactMsg(self.advertId)
+        mobj.msg('a test')
+        mobj.send()
+        blather.process()
+        blather.tasks.getWorkerPool().join()
+        blather.stop()
+
+        self.assertEqual(len(pool), 0)
+        self.assertTrue(rq[0] is mobj)
+        self.assertEqual(mobj.listCmds()[0][0], 'msg')
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
@@ -0,0 +1,136 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import weakref
+import unittest
+
+from TG.blathernet import Blather
+from TG.blathernet.base import PacketNS
+from TG.blathernet.messages import advertIdForNS, packet_v02 as packet
+from TG.blathernet.messages.stats import MsgStats, LatencyHistogram
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestMsgStats(unittest.TestCase):
+    advertId = advertIdForNS('testStats')
+    otherAdvertId = advertIdForNS('testStats/other')
+
+    def testCount(self):
+        stats = MsgStats()
+        stats.count(self.advertId, None, stats.iReceived)
+        stats.count(self.advertId, 'routeA', stats.iReceived)
+        stats.count(self.otherAdvertId, 'routeA', stats.iForwarded, 3)
+
+        self.assertEqual(stats.getAdvert(self.advertId)['received'], 2)
+        self.assertEqual(stats.getAdvert(self.otherAdvertId)['forwarded'], 3)
+        self.assertEqual(stats.getRoute('routeA')['received'], 1)
+        self.assertEqual(stats.getRoute('routeA')['forwarded'], 3)
+        self.assertEqual(stats.getRoute('routeB')['received'], 0)
+        self.assertEqual(stats.totals()['received'], 2)
+        self.assertEqual(stats.topAdverts('forwarded', 1), [(3, self.otherAdvertId)])
+
+        snap = stats.snapshot()
+        self.assertEqual(set(snap['routes']), set([None, 'routeA']))
+        stats.count(self.advertId, None, stats.iReceived)
+        self.assertEqual(snap['adverts'][self.advertId]['received'], 2)
+
+    def testRowCap(self):
+        stats = MsgStats(maxAdvertRows=4, maxRouteRows=2)
+        for i in xrange(10):
+            stats.count(advertIdForNS('testStats/%s' % i), 'route%s' % i, stats.iReceived)
+
+        self.assertEqual(len(stats.advertRows), 5)
+        self.assertEqual(len(stats.routeRows), 3)
+        self.assertEqual(stats.getAdvert(stats.otherKey)['received'], 6)
+        self.assertEqual(stats.getRoute(stats.otherKey)['received'], 8)
+        self.assertEqual(stats.totals()['received'], 10)
+
+    def testPruneRoutes(self):
+        class Route(object): pass
+        stats = MsgStats(maxRouteRows=2)
+        routes = [Route() for i in xrange(3)]
+        wrRoutes = [weakref.ref(r) for r in routes]
+        for wr in wrRoutes[:2]:
+            stats.count(self.advertId, wr, stats.iReceived)
+
+        del routes[0]
+        stats.count(self.advertId, wrRoutes[2], stats.iReceived)
+        self.assertFalse(wrRoutes[0] in stats.routeRows)
+        self.assertEqual(stats.getRoute(wrRoutes[2])['received'], 1)
+        self.assertEqual(stats.getRoute(stats.otherKey)['received'], 1)
+
+        del routes[0]
+        self.assertEqual(stats.pruneRoutes(), 1)
+        self.assertEqual(stats.getRoute(stats.otherKey)['received'], 2)
+        self.assertEqual(len(stats.freeRows), 1)
+
+        stats.count(self.advertId, 'routeA', stats.iReceived)
+        self.assertEqual(stats.freeRows, [])
+        self.assertEqual(stats.getRoute('routeA')['received'], 1)
+
+    def testMessageMgr(self):
+        rq = []
+        def fnResponder(body, fmt=0, topic=None, mctx=None):
+            rq.append(body)
+
+        blather = Blather()
+        blather.addResponderFn(self.advertId, fnResponder)
+
+        pkts = [packet.MsgObject(advertId).msg('body').encode()
+                    for advertId in [self.advertId, self.otherAdvertId]]
+        for pkt in pkts + pkts[:1]:
+            blather.msgs.queuePacket(PacketNS(pkt.packet, recvRoute='routeA'))
+        blather.process()
+
+        stats = blather.msgs.stats
+        self.assertEqual(rq, ['body'])
+        self.assertEqual(stats.getAdvert(self.advertId), dict(received=2,
+                decoded=1, duplicate=1, dispatched=1, forwarded=0, unhandled=0))
+        self.assertEqual(stats.getAdvert(self.otherAdvertId)['unhandled'], 1)
+        self.assertEqual(stats.getRoute('routeA')['received'], 3)
+
+class TestLatencyHistogram(unittest.TestCase):
+    def testBuckets(self):
+        h = LatencyHistogram()
+        self.assertEqual(h.percentile(0.5), None)
+
+        self.assertEqual(h.add(0), 0)
+        self.assertEqual(h.add(15e-6), 1)
+        self.assertEqual(h.add(0.001), 7)
+        self.assertEqual(h.add(1e9), h.nBuckets-1)
+        self.assertEqual(h.count, 4)
+        self.assertEqual(h.maxLatency, 1e9)
+
+    def testPercentiles(self):
+        h = LatencyHistogram()
+        for i in xrange(99):
+            h.add(5e-6)
+        h.add(0.5)
+
+        self.assertEqual(h.percentile(0.5), h.minLatency)
+        self.assertEqual(h.percentile(0.99), h.minLatency)
+        self.assertTrue(h.percentile(1.0) >= 0.5)
+
+        snap = h.snapshot()
+        self.assertEqual(snap['count'], 100)
+        self.assertEqual(sum(c for b, c in snap['buckets']), 100)
+        self.assertEqual(snap['p50'], h.minLatency)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
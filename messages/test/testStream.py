@@ -0,0 +1,75 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+from StringIO import StringIO
+
+from TG.blathernet.messages import advertIdForNS, packet_v02 as packet
+from TG.blathernet.messages.stream import packStream, MsgStreamWriter, MsgStreamDecoder, iterStream
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestStream(unittest.TestCase):
+    advertId = advertIdForNS('testStream')
+
+    def newPackets(self, count):
+        return [packet.MsgObject(self.advertId).msg(('%s' % i)*(7*i)).encode().packet
+                for i in xrange(count)]
+
+    def testChunkSizes(self):
+        packets = self.newPackets(12)
+        stream = packStream(packets)
+        for chunkSize in [1, 2, 3, 17, 100, len(stream)]:
+            decoder = MsgStreamDecoder(route='aRoute')
+            pkts = []
+            for i in xrange(0, len(stream), chunkSize):
+                pkts.extend(decoder.feed(stream[i:i+chunkSize]))
+            decoder.close()
+
+            self.assertEqual([p.packet for p in pkts], packets)
+            self.assertEqual(set(p.route for p in pkts), set(['aRoute']))
+
+    def testDecodePackets(self):
+        mobj = packet.MsgObject(self.advertId).forward().msg('body', 1, 'topic')
+        stream = packStream([mobj.encode().packet]*2)
+        decoder = MsgStreamDecoder()
+        pkt0, = decoder.feed(stream[:-5])
+        pkt1, = decoder.feed(stream[-5:])
+        for pkt in [pkt0, pkt1]:
+            self.assertEqual(packet.MsgObject.fromData(pkt).listCmds(), mobj.listCmds())
+
+    def testTruncated(self):
+        stream = packStream(self.newPackets(3))
+        decoder = MsgStreamDecoder()
+        self.assertEqual(len(decoder.feed(stream[:-1])), 2)
+        self.assertEqual(len(decoder), len(stream) - len(packStream(self.newPackets(2))) - 1)
+        self.assertRaises(ValueError, decoder.close)
+
+    def testRecordReplay(self):
+        packets = self.newPackets(20)
+        out = StringIO()
+        writer = MsgStreamWriter(out)
+        writer.write(packets[0])
+        writer.writeMany(packets[1:])
+
+        out.seek(0)
+        self.assertEqual([p.packet for p in iterStream(out, 50)], packets)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
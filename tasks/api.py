@@ -28,7 +28,7 @@ class ITaskAPI(object):
 
     def addTimer(self, tsStart, task):
         raise NotImplementedError('Interface method: %r' % (self,))
-    def addTask(self, task):
+    def addTask(self, task, lane=None):
         raise NotImplementedError('Interface method: %r' % (self,))
 
     def addTaskFn(self, fn, *args, **kw):
@@ -55,6 +55,6 @@ class TaskDelegateAPI(ITaskAPI):
 
     def addTimer(self, tsStart, task):
         return self._tasks_.addTimer(tsStart, task)
-    def addTask(self, task):
-        return self._tasks_.addTask(task)
+    def addTask(self, task, lane=None):
+        return self._tasks_.addTask(task, lane)
 
@@ -13,6 +13,7 @@
 from __future__ import with_statement
 
 from functools import partial
+from collections import deque
 from heapq import heappop, heappush
 
 from ..base import BlatherObject, timestamp, sleep
@@ -20,16 +21,54 @@ from ..base.tracebackBoundry import localtb
 from ..base.threadutils import threadcall, dispatchInThread, Event, Lock
 
 from .api import ITaskAPI
+from .pool import TaskWorkerPool
 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 #~ Definitions 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+class TaskLane(object):
+    """Priority lane of the task run queue.
+
+    Each pass runs at most weight*laneQuantum of the lane's tasks, or all
+    of them when weight is None.  A lane with a maxDepth sheds its oldest
+    tasks once that many are queued."""
+
+    def __init__(self, name, weight=None, maxDepth=None):
+        self.name = name
+        self.weight = weight
+        self.maxDepth = maxDepth
+        self.queue = deque()
+        self.peakDepth = 0
+        self.nRun = 0
+        self.nShed = 0
+
+    def __repr__(self):
+        return '<lane %s |%s|>' % (self.name, len(self.queue))
+
+    def __len__(self):
+        return len(self.queue)
+
+    def stats(self):
+        return dict(name=self.name, weight=self.weight, depth=len(self.queue),
+                peakDepth=self.peakDepth, run=self.nRun, shed=self.nShed)
+
 class BasicBlatherTaskMgr(BlatherObject, ITaskAPI):
     done = False
     timeout = 0.05
     tasksleep = sleep
 
+    # lanes in priority order: timers and control tasks always run in full,
+    # local dispatch and forward relays share each pass by weight, and the
+    # relay lane is the one bounded lane, so it sheds first under overload
+    laneControl, laneDispatch, laneRelay = range(3)
+    laneConfig = [
+        ('control', None, None),
+        ('dispatch', 4, None),
+        ('relay', 1, 8192)]
+    laneQuantum = 128
+    laneDefault = laneDispatch
+
     def __init__(self, name):
         BlatherObject.__init__(self)
         self.name = name
@@ -37,46 +76,115 @@ class BasicBlatherTaskMgr(BlatherObject, ITaskAPI):
 
     def initTasks(self):
         self.lockTasks = Lock()
-        self.tasks = set()
+        # FIFO run queue lanes of callable tasks, and the set of iterator
+        # tasks that are advanced once every pass until exhausted
+        self.lanes = [TaskLane(*cfg) for cfg in self.laneConfig]
+        self.iterTasks = set()
         self._e_tasks = Event()
         self.setTaskSleep()
 
     def __repr__(self):
-        return '<TM %s |%s|>' % (self.name, len(self.tasks))
+        return '<TM %s |%s|>' % (self.name, len(self))
 
     def __len__(self):
-        return len(self.tasks)
+        return sum(len(lane.queue) for lane in self.lanes) + len(self.iterTasks)
+
+    def laneStats(self):
+        """Returns a list of per lane queue depth and throughput dicts"""
+        return [lane.stats() for lane in self.lanes]
 
     def setTaskSleep(self, tasksleep=None):
         if tasksleep is None:
             tasksleep = self._e_tasks.wait
         self.tasksleep = tasksleep
 
-    def addTask(self, task):
+    def addTask(self, task, lane=None):
         if task is None:
             return None
 
         with self.lockTasks:
-            self.tasks.add(task)
+            if hasattr(task, 'next'):
+                self.iterTasks.add(task)
+            else:
+                if lane is None:
+                    lane = self.laneDefault
+                lane = self.lanes[lane]
+                q = lane.queue
+                q.append(task)
+                if len(q) > lane.peakDepth or lane.maxDepth is not None:
+                    self._enqueue(lane, ())
         self._e_tasks.set()
         return task
 
-    def extendTasks(self, tasks):
+    def extendTasks(self, tasks, lane=None):
+        if lane is None:
+            lane = self.laneDefault
+
+        runQ = []; iterTasks = []
+        for t in tasks:
+            if t is None: 
+                continue
+            if hasattr(t, 'next'):
+                iterTasks.append(t)
+            else: runQ.append(t)
+
         with self.lockTasks:
-            self.tasks.update(t for t in tasks if t is not None)
+            self._enqueue(self.lanes[lane], runQ)
+            self.iterTasks.update(iterTasks)
         self._e_tasks.set()
 
+    def _enqueue(self, lane, tasks):
+        # called with lockTasks held
+        q = lane.queue
+        q.extend(tasks)
+
+        depth = len(q)
+        if depth > lane.peakDepth:
+            lane.peakDepth = depth
+
+        maxDepth = lane.maxDepth
+        if maxDepth is not None and depth > maxDepth:
+            # shed the oldest tasks of the lane
+            popleft = q.popleft
+            for i in xrange(depth - maxDepth):
+                popleft()
+            lane.nShed += depth - maxDepth
+
     def setDone(self, bDone=True):
         self.done = bDone
         self._e_tasks.set()
 
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+    #~ Worker Pool
+    #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    TaskWorkerPool = TaskWorkerPool
+    workerPoolSize = 4
+    _workerPool = None
+
+    def getWorkerPool(self):
+        """Returns the pool of threads for work kept off this task manager,
+        started on first use"""
+        pool = self._workerPool
+        if pool is None:
+            pool = self.TaskWorkerPool(self.workerPoolSize)
+            self._workerPool = pool
+        return pool
+    workerPool = property(getWorkerPool)
+
+    def stopWorkerPool(self):
+        pool = self._workerPool
+        if pool is not None:
+            self._workerPool = None
+            pool.stop()
+
     def processUntilDone(self):
         isDone = lambda n: False
         return self.processLoop(isDone)
 
     def process(self, allActive=True):
         if allActive:
-            isDone = lambda n: (not self.tasks)
+            isDone = lambda n: (not len(self))
         else:
             isDone = lambda n: True
         return self.processLoop(isDone)
@@ -94,26 +202,64 @@ class BasicBlatherTaskMgr(BlatherObject, ITaskAPI):
         return tn
 
     def processTasks(self):
-        n = 0
-        activeTasks = self.tasks
+        """Runs each lane's share of the tasks queued before this pass, in
+        lane priority and FIFO order, then advances each iterator task
+        once.  Lane batches are taken, and continuing tasks requeued, under
+        one lock each."""
         self._e_tasks.clear()
-        if not activeTasks:
-            return n
+        lanes = self.lanes
+        quantum = self.laneQuantum
 
         lockTasks = self.lockTasks
-        fireTask = self._processFiredTask
-        for task in list(activeTasks):
-            with lockTasks:
-                activeTasks.discard(task)
+        with lockTasks:
+            batches = []
+            for lane in lanes:
+                q = lane.queue
+                if not q: 
+                    continue
+
+                weight = lane.weight
+                if weight is None or len(q) <= weight*quantum:
+                    # swap the whole lane queue out
+                    lane.queue = deque()
+                    batches.append((lane, q))
+                else:
+                    popleft = q.popleft
+                    batches.append((lane, [popleft() for i in xrange(weight*quantum)]))
 
-            if task: 
+            iterTasks = self.iterTasks
+            iterTasks = list(iterTasks) if iterTasks else None
+
+        if not (batches or iterTasks):
+            return 0
+
+        n = 0
+        fireTask = self._processFiredTask
+        requeue = []; started = []
+        for lane, batch in batches:
+            lane.nRun += len(batch)
+            for task in batch:
                 n += 1
                 task = fireTask(task)
+                if task: 
+                    if hasattr(task, 'next'):
+                        started.append(task)
+                    else: requeue.append((lane, task))
+
+        finished = []
+        if iterTasks:
+            for task in iterTasks:
+                n += 1
+                if not fireTask(task):
+                    finished.append(task)
 
-            if task: 
-                with lockTasks:
-                    activeTasks.add(task)
-
+        if requeue or started or finished:
+            with lockTasks:
+                enqueue = self._enqueue
+                for lane, task in requeue:
+                    enqueue(lane, [task])
+                self.iterTasks.update(started)
+                self.iterTasks.difference_update(finished)
         return n
 
     def _processFiredTask(self, task):
@@ -208,7 +354,7 @@ class BasicBlatherTimerMgr(BasicBlatherTaskMgr):
 
         if firedTimers:
             fireTask = self._processFiredTimerTask
-            self.extendTasks(partial(fireTask, ts, tfn) for tfn in firedTimers)
+            self.extendTasks((partial(fireTask, ts, tfn) for tfn in firedTimers), self.laneControl)
 
     def _processFiredTimerTask(self, ts, task):
         if callable(task):
@@ -246,6 +392,7 @@ class BlatherTaskMgr(BasicBlatherTimerMgr):
 
     def stop(self):
         self.setDone(True)
+        self.stopWorkerPool()
 
     def runJoin(self, timeout=None):
         tt = self.runThreaded()
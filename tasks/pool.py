@@ -0,0 +1,70 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import with_statement
+
+from Queue import Queue
+
+from ..base.tracebackBoundry import localtb
+from ..base.threadutils import dispatchInThread
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TaskWorkerPool(object):
+    """Daemon threads that run callable tasks off the task manager thread.
+
+    Tasks are run once, in the order added, by whichever worker is free;
+    anything they need to do on the task manager must be handed back with
+    its addTask."""
+
+    def __init__(self, nWorkers=4):
+        self.nWorkers = nWorkers
+        self.queue = Queue()
+        self.workers = [dispatchInThread(self._workerLoop) for i in xrange(nWorkers)]
+
+    def __repr__(self):
+        return '<%s workers: %s |%s|>' % (self.__class__.__name__, self.nWorkers, len(self))
+
+    def __len__(self):
+        return self.queue.qsize()
+
+    def addTask(self, task):
+        if task is None:
+            return None
+        self.queue.put(task)
+        return task
+
+    def stop(self):
+        # one sentinel per worker; tasks already queued still run
+        for w in self.workers:
+            self.queue.put(None)
+        self.workers = []
+
+    def join(self, timeout=None):
+        self.queue.join()
+
+    def _workerLoop(self):
+        get = self.queue.get
+        taskDone = self.queue.task_done
+        while 1:
+            task = get()
+            try:
+                if task is None:
+                    return
+                with localtb:
+                    task()
+            finally:
+                taskDone()
+
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+"""Task manager micro-benchmarks; not collected by the unittest suites"""
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import time
+from functools import partial
+
+from TG.blathernet.tasks.manager import BlatherTaskMgr
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def timed(name, fn, count):
+    t0 = time.time()
+    fn()
+    dt = time.time() - t0
+    print '%-32s %8d tasks in %6.3fs  %10.0f tasks/s' % (name, count, dt, count/dt)
+    return dt
+
+def noop(i):
+    pass
+
+def benchTasks(count=100000):
+    tm = BlatherTaskMgr('bench')
+    tasks = [partial(noop, i) for i in xrange(count)]
+
+    def addAndProcess():
+        for task in tasks:
+            tm.addTask(task)
+        tm.process()
+    timed('addTask + process', addAndProcess, count)
+
+    def extendAndProcess():
+        tm.extendTasks(tasks)
+        tm.process()
+    timed('extendTasks + process', extendAndProcess, count)
+
+    def tickTask():
+        for i in xrange(passes):
+            yield
+    passes = 1000; nGen = 100
+    def generators():
+        for i in xrange(nGen):
+            tm.addTask(partial(tickTask))
+        tm.process()
+    timed('generator task passes', generators, passes*nGen)
+
+    def lanes():
+        tm.extendTasks(tasks[:count//2], tm.laneRelay)
+        tm.extendTasks(tasks[count//2:], tm.laneDispatch)
+        tm.process()
+    timed('dispatch and relay lanes', lanes, count)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Main 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def main():
+    benchTasks()
+
+if __name__=='__main__':
+    main()
+
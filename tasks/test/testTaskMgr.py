@@ -0,0 +1,150 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+from functools import partial
+
+from TG.blathernet.tasks.manager import BlatherTaskMgr
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestTaskMgr(unittest.TestCase):
+    def setUp(self):
+        self.tm = BlatherTaskMgr('testTaskMgr')
+        self.rq = []
+
+    def record(self, item):
+        self.rq.append(item)
+
+    def testFIFO(self):
+        tm = self.tm
+        for i in xrange(50):
+            tm.addTask(partial(self.record, i))
+        tm.extendTasks([partial(self.record, i) for i in xrange(50, 100)] + [None])
+        self.assertEqual(len(tm), 100)
+
+        self.assertEqual(tm.processTasks(), 100)
+        self.assertEqual(self.rq, range(100))
+        self.assertEqual(len(tm), 0)
+
+    def testAddedWhileProcessing(self):
+        tm = self.tm
+        def addMore():
+            self.record('first')
+            tm.addTask(partial(self.record, 'next pass'))
+        tm.addTask(addMore)
+
+        self.assertEqual(tm.processTasks(), 1)
+        self.assertEqual(self.rq, ['first'])
+        self.assertEqual(tm.processTasks(), 1)
+        self.assertEqual(self.rq, ['first', 'next pass'])
+
+    def testRequeue(self):
+        tm = self.tm
+        counts = [3]
+        def countdown():
+            self.record(counts[0])
+            counts[0] -= 1
+            return counts[0] > 0 and countdown
+
+        tm.addTask(countdown)
+        tm.process()
+        self.assertEqual(self.rq, [3, 2, 1])
+
+    def testIterTasks(self):
+        tm = self.tm
+        def ticker(name, n):
+            for i in xrange(n):
+                self.record((name, i))
+                yield
+
+        gen = ticker('a', 3)
+        tm.addTask(gen)
+        tm.addTask(gen)
+        tm.addTask(partial(ticker, 'b', 2))
+        self.assertEqual(len(tm), 2)
+
+        tm.processTasks()
+        self.assertEqual(self.rq, [('b', 0), ('a', 0)])
+        self.assertEqual(len(tm.iterTasks), 2)
+
+        tm.process()
+        self.assertEqual(sorted(self.rq), [('a', 0), ('a', 1), ('a', 2), ('b', 0), ('b', 1)])
+        self.assertEqual(len(tm), 0)
+
+    def testLanePriority(self):
+        tm = self.tm
+        tm.addTask(partial(self.record, 'relay'), tm.laneRelay)
+        tm.addTask(partial(self.record, 'dispatch'))
+        tm.addTask(partial(self.record, 'control'), tm.laneControl)
+
+        self.assertEqual(tm.processTasks(), 3)
+        self.assertEqual(self.rq, ['control', 'dispatch', 'relay'])
+
+    def testLaneWeights(self):
+        tm = self.tm
+        tm.laneQuantum = 2
+        tm.extendTasks([partial(self.record, ('r', i)) for i in xrange(10)], tm.laneRelay)
+        tm.extendTasks([partial(self.record, ('d', i)) for i in xrange(10)], tm.laneDispatch)
+
+        # dispatch weight 4 and relay weight 1, times a quantum of 2
+        self.assertEqual(tm.processTasks(), 10)
+        self.assertEqual([lane for lane, i in self.rq].count('d'), 8)
+        self.assertEqual([lane for lane, i in self.rq].count('r'), 2)
+        self.assertEqual(len(tm), 10)
+
+        tm.process()
+        self.assertEqual(len(self.rq), 20)
+        self.assertEqual([i for lane, i in self.rq if lane == 'r'], range(10))
+
+    def testRelayShedding(self):
+        tm = self.tm
+        relay = tm.lanes[tm.laneRelay]
+        relay.maxDepth = 5
+        tm.extendTasks([partial(self.record, i) for i in xrange(8)], tm.laneRelay)
+        tm.addTask(partial(self.record, 8), tm.laneRelay)
+
+        stats = tm.laneStats()[tm.laneRelay]
+        self.assertEqual(stats['name'], 'relay')
+        self.assertEqual(stats['depth'], 5)
+        self.assertEqual(stats['peakDepth'], 8)
+        self.assertEqual(stats['shed'], 4)
+
+        tm.process()
+        self.assertEqual(self.rq, [4, 5, 6, 7, 8])
+        self.assertEqual(tm.laneStats()[tm.laneRelay]['run'], 5)
+
+    def testRequeueSheds(self):
+        tm = self.tm
+        relay = tm.lanes[tm.laneRelay]
+        def again():
+            self.record('again')
+            return again
+        tm.extendTasks([again]*3, tm.laneRelay)
+        relay.maxDepth = 2
+        relay.peakDepth = 0
+
+        # continuing tasks are requeued through the same depth limit
+        self.assertEqual(tm.processTasks(), 3)
+        self.assertEqual(len(relay), 2)
+        self.assertEqual(relay.nShed, 1)
+        self.assertEqual(relay.peakDepth, 3)
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
+
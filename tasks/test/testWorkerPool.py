@@ -0,0 +1,70 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+import unittest
+import threading
+from functools import partial
+
+from TG.blathernet.tasks.pool import TaskWorkerPool
+from TG.blathernet.tasks.manager import BlatherTaskMgr
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = TaskWorkerPool(3)
+        self.rq = []
+
+    def tearDown(self):
+        self.pool.stop()
+
+    def record(self, item):
+        self.rq.append((item, threading.currentThread()))
+
+    def testRunsOffThread(self):
+        pool = self.pool
+        for i in xrange(20):
+            pool.addTask(partial(self.record, i))
+        pool.join()
+
+        self.assertEqual(sorted(i for i, t in self.rq), range(20))
+        mainThread = threading.currentThread()
+        self.assertFalse([t for i, t in self.rq if t is mainThread])
+
+    def testFailingTask(self):
+        pool = self.pool
+        def fail():
+            raise RuntimeError("expected failure in a worker task")
+        pool.addTask(fail)
+        pool.addTask(partial(self.record, 'after'))
+        pool.join()
+        self.assertEqual([i for i, t in self.rq], ['after'])
+
+    def testTaskMgrPool(self):
+        tm = BlatherTaskMgr('testWorkerPool')
+        pool = tm.getWorkerPool()
+        self.assertTrue(tm.workerPool is pool)
+        self.assertEqual(len(pool.workers), tm.workerPoolSize)
+
+        tm.stop()
+        self.assertEqual(len(pool.workers), 0)
+        self.assertTrue(tm.getWorkerPool() is not pool)
+        tm.stopWorkerPool()
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()
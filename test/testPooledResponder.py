@@ -0,0 +1,122 @@
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+##~ Copyright (C) 2002-2009  TechGame Networks, LLC.              ##
+##~                                                               ##
+##~ This library is free software; you can redistribute it        ##
+##~ and/or modify it under the terms of the BSD style License as  ##
+##~ found in the LICENSE file included with this distribution.    ##
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~##
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Imports 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+from __future__ import with_statement
+import unittest
+import threading
+from TG.blathernet import Blather, advertIdForNS
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Definitions 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+class TestPooledResponder(unittest.TestCase):
+    advertId = advertIdForNS('testPooled/request')
+    replyAdvertId = advertIdForNS('testPooled/reply')
+
+    def setUp(self):
+        self.blather = Blather()
+        self.rq = []
+
+    def tearDown(self):
+        self.blather.stop()
+
+    def processUntil(self, count, passes=200):
+        blather = self.blather
+        pool = blather.tasks.getWorkerPool()
+        for i in xrange(passes):
+            blather.process()
+            pool.join()
+            if len(self.rq) >= count:
+                break
+
+    def testReplyFromWorker(self):
+        blather = self.blather
+        rq = self.rq
+        def onRequest(body, fmt, topic, mctx):
+            rq.append(('request', body, threading.currentThread()))
+            with mctx.sendTo(self.replyAdvertId) as mobj:
+                mobj.msg(body.upper())
+
+        def onReply(body, fmt, topic, mctx):
+            rq.append(('reply', body, threading.currentThread()))
+
+        blather.respondTo(self.advertId, onRequest, pooled=True)
+        blather.respondTo(self.replyAdvertId, onReply)
+
+        with blather.sendTo(self.advertId) as mobj:
+            mobj.msg('ping')
+        self.processUntil(2)
+
+        self.assertEqual([(k, body) for k, body, t in rq],
+                [('request', 'ping'), ('reply', 'PING')])
+        mainThread = threading.currentThread()
+        self.assertTrue(rq[0][-1] is not mainThread)
+        self.assertTrue(rq[1][-1] is mainThread)
+
+        pooled, = blather.advertDb[self.advertId].allResponders()
+        self.assertEqual(pooled.latency.count, 1)
+        self.assertEqual(pooled.stats()['runLatency']['count'], 1)
+
+    def testForwardWhenUnhandled(self):
+        blather = self.blather
+        class RecordingRoute(object):
+            def __init__(self):
+                self.sent = []
+            def sendDispatch(self, data):
+                self.sent.append(data)
+        route = RecordingRoute()
+        blather.advertDb.addRoutes(self.advertId, [route])
+
+        def onRequest(body, fmt, topic, mctx):
+            self.rq.append(body)
+        blather.respondTo(self.advertId, onRequest, pooled=True)
+
+        with blather.sendTo(self.advertId) as mobj:
+            mobj.msg('ping')
+            mobj.forward(whenUnhandled=True)
+        self.processUntil(1)
+        blather.process()
+
+        self.assertEqual(self.rq, ['ping'])
+        self.assertEqual(len(route.sent), 1)
+        stats = blather.msgs.stats.getAdvert(self.advertId)
+        self.assertEqual((stats['dispatched'], stats['unhandled'], stats['forwarded']), (0, 1, 1))
+
+    def testRemovePooled(self):
+        blather = self.blather
+        class Responder(object):
+            def isAdvertResponder(self): return True
+            def msg(_, body, fmt, topic, mctx): self.rq.append(body)
+
+        r = Responder()
+        self.assertTrue(blather.addResponder(self.advertId, r, pooled=True))
+        self.assertFalse(blather.addResponder(self.advertId, r, pooled=True))
+        self.assertTrue(blather.removeResponder(self.advertId, r))
+        self.assertEqual(blather.advertDb[self.advertId].allResponders(), [])
+
+        # a wrapper is a registration of its own, distinct from r
+        pooled = blather.advertDb.PooledAdvertResponder(r, None, None)
+        self.assertNotEqual(pooled, r)
+        self.assertTrue(blather.addResponder(self.advertId, r))
+        self.assertTrue(blather.addResponder(self.advertId, pooled))
+        self.assertTrue(blather.removeResponder(self.advertId, r))
+        self.assertEqual(blather.advertDb[self.advertId].allResponders(), [pooled])
+        self.assertTrue(blather.removeResponder(self.advertId, pooled))
+        self.assertFalse(blather.removeResponder(self.advertId, r))
+
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#~ Unittest Main  
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+if __name__=='__main__':
+    unittest.main()